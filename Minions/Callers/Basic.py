@@ -1,75 +1,46 @@
 import random
 import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from Utils.Names import MAIN_MINIONS, SUB_MINIONS
 from Utils.SkillGraph import SkillGraph
-
-from openai import OpenAI
-from google import genai
-from google.genai import types
+from Utils.SingleFlight import SingleFlight
+from Utils.MinionTool import MinionTool
+from Utils.MinionBase import BaseSubMinion, BaseOrchestrator, BaseMainMinion
 
 load_dotenv()
-gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-genClient = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+logger = logging.getLogger(__name__)
 
 graph = SkillGraph()
-skillInstructions = graph.skillInstructions()
-
-class MinionTool:
-    def __init__(self):
-        self.provider    = os.getenv("PROVIDER", "openai")
-        self.providerMap = {
-            "openai": self.runOpenai,
-            "google": self.runGoogle,
-        }
 
-    def run(self, systemMsg, userMsg):
-        try:
-            return self.providerMap[self.provider](systemMsg, userMsg)
-        except KeyError:
-            raise ValueError("Invalid LLM provider. Use 'openai' or 'google'.")
-
-    def runOpenai(self, systemMsg, userMsg):
-        prompt = [
-            graph.handleJsonFormat("system", systemMsg),
-            graph.handleJsonFormat("user", userMsg)
-        ]
-        return gptClient.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=prompt,
-        ).choices[0].message.content
-
-    def runGoogle(self, systemMsg, userMsg):
-        system = [graph.handleTypedFormat("system", systemMsg)]
-        model = "gemini-2.5-flash-preview-04-17"
-        contents = []
-        contents.append(graph.handleTypedFormat("user", userMsg))
-
-        generateContentConfig = types.GenerateContentConfig(
-            response_mime_type="text/plain",
-            system_instruction=system,  # List of Parts
-        )
-        return genClient.models.generate_content(
-            model=model,
-            contents=contents,
-            config=generateContentConfig,
-        ).text
-
-
-class SubMinion:
-    def __init__(self, task, minionName):
+class SubMinion(BaseSubMinion):
+    def __init__(self, task, minionName, flight=None):
         self.minionTool = MinionTool()
         self.task      = task
         self.minionName = minionName
+        self.flight    = flight
 
     def run(self, verbose=False):
-        clarified = self.minionTool.run(skillInstructions, self.task)
+        clarified = self.clarify(self.task)
+        return self.executeClarified(clarified, verbose=verbose)
+
+    async def arun(self, verbose=False):
+        clarified = await self.aclarify(self.task)
+        # Skills do blocking I/O, so they run off the event loop
+        return await asyncio.to_thread(self.executeClarified, clarified, verbose)
+
+    def executeClarified(self, clarified, verbose=False):
         if verbose:
             print(f"[{self.minionName}] Clarified action: {clarified}")
-        actions = graph.getActions(clarified)
-        allSkills = graph.getMinionActions()
-        results = graph.executeActions(allSkills, actions)
+        if isinstance(clarified, list):
+            results = graph.executeToolCalls(clarified, flight=self.flight)
+        else:
+            actions = graph.getActions(clarified)
+            allSkills = graph.getMinionActions()
+            results = graph.executeActions(allSkills, actions, flight=self.flight)
         filtered = [str(r) for r in results if r]
         finalResult = "\n".join(filtered)
         if verbose:
@@ -77,81 +48,150 @@ class SubMinion:
         return finalResult or "No action result. Banana!"
 
 
-class OrchestratorMinion:
-    def __init__(self):
+class OrchestratorMinion(BaseOrchestrator):
+    def __init__(self, concurrent=None, maxWorkers=None):
         self.minionTool = MinionTool()
+        self.concurrent = concurrent if concurrent is not None else os.getenv("CONCURRENT_MINIONS", "True") == "True"
+        self.maxWorkers = maxWorkers or int(os.getenv("MAX_MINION_WORKERS", "4"))
+
+    def assignSteps(self, steps):
+        return [(step, SUB_MINIONS[(i - 1) % len(SUB_MINIONS)]) for i, step in enumerate(steps, 1)]
 
-    def decomposeSteps(self, userGoal):
-        availableActions = graph.getMinionActions()
-        prompt = (
-            "Given the following available actions:\n"
-            f"{', '.join(availableActions)}\n"
-            "If the goal can be answered directly without calling any of these actions, say 'NO ACTIONS NEEDED'.\n"
-            "Otherwise, break down the goal into the MINIMUM number of direct function calls, each matching exactly one of the available actions. "
-            "If an action can't be matched directly, SKIP that step. "
-            "Do NOT include high-level or abstract instructions. "
-            "Just output a bullet list, one per function call, e.g.:\n"
-            "- get_temperature(47.6588, -117.4260)\n"
-            f"Goal: {userGoal}"
-        )
-        stepsText = self.minionTool.run("You are an expert orchestrator minion.", prompt)
-        steps = [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
-        return steps
-
-    def run(self, mainMinion, userGoal, verbose=False):
-        steps = self.decomposeSteps(userGoal)
+    def expandResults(self, steps, stepIndex, results):
+        """Report every original step, sharing the result of the unique step that served it."""
+        return [{**results[i], "step": step} for step, i in zip(steps, stepIndex)]
+
+    def run(self, mainMinion, userGoal, verbose=False, plan=None):
+        steps = plan["steps"] if plan else self.decomposeSteps(userGoal)
         results = []
-        stepsClean = [s.lower().strip() for s in steps]
-        if not steps or any("no action" in s for s in stepsClean):
+        if self.needsDirectAnswer(steps):
             if verbose:
                 print(f"\n[{mainMinion}] No sub-minions needed! Bello! I answer directly, banana!")
-            answer = self.minionTool.run(
-                "You are a helpful minion who answers questions directly if no tools/actions are required.",
-                f"Answer this question in a fun minion way: \"{userGoal}\". Always end with a minion quote like: 'Bello!'"
-            )
+            answer = (plan and plan["answer"]) or self.minionTool.run(*self.directAnswerPrompt(userGoal))
             return [{"step": "direct_answer", "result": answer}]
-        for i, step in enumerate(steps, 1):
-            subMinionName = SUB_MINIONS[(i - 1) % len(SUB_MINIONS)]
+        # Identical steps and tool calls within this goal run once and share their result
+        flight = SingleFlight()
+        uniqueSteps, stepIndex = self.dedupeSteps(steps)
+        if verbose and len(uniqueSteps) < len(steps):
+            print(f"\n[{mainMinion}] {len(steps) - len(uniqueSteps)} duplicate step(s) share a result, banana!")
+        jobs = self.assignSteps(uniqueSteps)
+        if self.concurrent and len(jobs) > 1:
+            results = self.runConcurrent(mainMinion, jobs, flight=flight, verbose=verbose)
+        else:
+            for step, subMinionName in jobs:
+                results.append(self.runSubMinion(mainMinion, step, subMinionName, flight=flight, verbose=verbose))
+        return self.expandResults(steps, stepIndex, results)
+
+    async def arun(self, mainMinion, userGoal, verbose=False, plan=None):
+        steps = plan["steps"] if plan else await self.adecomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
             if verbose:
-                print(f"\n[{mainMinion}] Executing sub-minion [{subMinionName}] for task: {step} Bello!")
-            subMinion = SubMinion(step, subMinionName)
-            result = subMinion.run(verbose=verbose)
-            results.append({"step": step, "result": result})
-        return results
-
-class MainMinion:
-    def __init__(self):
+                print(f"\n[{mainMinion}] No sub-minions needed! Bello! I answer directly, banana!")
+            answer = (plan and plan["answer"]) or await self.minionTool.arun(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
+        flight = SingleFlight()
+        uniqueSteps, stepIndex = self.dedupeSteps(steps)
+        if verbose and len(uniqueSteps) < len(steps):
+            print(f"\n[{mainMinion}] {len(steps) - len(uniqueSteps)} duplicate step(s) share a result, banana!")
+        # gather keeps the original step order
+        results = await asyncio.gather(*(
+            self.arunSubMinion(mainMinion, step, subMinionName, flight=flight, verbose=verbose)
+            for step, subMinionName in self.assignSteps(uniqueSteps)
+        ))
+        return self.expandResults(steps, stepIndex, results)
+
+    def runSubMinion(self, mainMinion, step, subMinionName, flight=None, verbose=False):
+        if verbose:
+            print(f"\n[{mainMinion}] Executing sub-minion [{subMinionName}] for task: {step} Bello!")
+        try:
+            subMinion = SubMinion(step, subMinionName, flight=flight)
+            return {"step": step, "result": subMinion.run(verbose=verbose)}
+        except Exception as e:
+            logger.error(f"Sub-minion {subMinionName} failed on step '{step}':", exc_info=True)
+            return {"step": step, "result": f"Error: {e}", "error": str(e)}
+
+    async def arunSubMinion(self, mainMinion, step, subMinionName, flight=None, verbose=False):
+        if verbose:
+            print(f"\n[{mainMinion}] Executing sub-minion [{subMinionName}] for task: {step} Bello!")
+        try:
+            subMinion = SubMinion(step, subMinionName, flight=flight)
+            return {"step": step, "result": await subMinion.arun(verbose=verbose)}
+        except Exception as e:
+            logger.error(f"Sub-minion {subMinionName} failed on step '{step}':", exc_info=True)
+            return {"step": step, "result": f"Error: {e}", "error": str(e)}
+
+    def runConcurrent(self, mainMinion, jobs, flight=None, verbose=False):
+        """
+        Fan out independent steps over a bounded thread pool.
+        Results are returned in the original step order.
+        """
+        workers = max(1, min(self.maxWorkers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SubMinion") as executor:
+            futures = [
+                executor.submit(self.runSubMinion, mainMinion, step, subMinionName, flight, verbose)
+                for step, subMinionName in jobs
+            ]
+            return [future.result() for future in futures]
+
+class MainMinion(BaseMainMinion):
+    def __init__(self, fusedPlanning=None):
         self.orchestrator = OrchestratorMinion()
         self.minionTool    = MinionTool()
+        self.fusedPlanning = fusedPlanning if fusedPlanning is not None else os.getenv("FUSED_PLANNING", "True") == "True"
 
-    def processInput(self, userGoal, verbose=False):
+    def gatherResults(self, userGoal, verbose=False):
         def llm(prompt):
             return self.minionTool.run("You are a helpful minion.", prompt)
         if verbose:
             print(f"\nBello!!! Banana!!!\n")
-        prompt = (
-            "You are a helpful minion. Restate the following user goal as a single clear task.\n"
-            f"User Goal: {userGoal}"
-        )
-        clarifiedGoal = llm(prompt)
+        # The fused plan saves a round trip, the two-call path is the fallback if it can't be parsed
+        plan = self.orchestrator.plan(userGoal) if self.fusedPlanning else None
+        clarifiedGoal = plan["goal"] if plan else llm(self.restatePrompt(userGoal))
+        mainMinion = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        if verbose:
+            print(f"[{mainMinion}]: {clarifiedGoal}")
+        results = self.orchestrator.run(mainMinion, clarifiedGoal, verbose=verbose, plan=plan)
+        return mainMinion, results
+
+    async def agatherResults(self, userGoal, verbose=False):
+        async def llm(prompt):
+            return await self.minionTool.arun("You are a helpful minion.", prompt)
+        if verbose:
+            print("\nBello!!! Banana!!!\n")
+        plan = await self.orchestrator.aplan(userGoal) if self.fusedPlanning else None
+        clarifiedGoal = plan["goal"] if plan else await llm(self.restatePrompt(userGoal))
         mainMinion = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
         if verbose:
             print(f"[{mainMinion}]: {clarifiedGoal}")
-        results = self.orchestrator.run(mainMinion, clarifiedGoal, verbose=verbose)
-        resultsSummary = "\n".join(
-            f"{r['step']}: {r['result']}" for r in results
-        )
-        minionPersonality = (
-            "Respond as if you are a Minion from the Minions movie. "
-            "Be silly, use funny minion phrases, sound happy, and always end with a minion quote! "
-            "Example ending: 'Bello!'\n"
-            "Mix some minion language (like 'banana', 'bello', 'poopaye', etc) with your answer, but still answer the user's question clearly.\n"
-        )
-        answer = llm(
-            f"{minionPersonality}"
-            f"User originally asked: \"{userGoal}\"\n"
-            f"Here are the results for that request:\n{resultsSummary}\n"
-            "Write your response now!"
-        )
-        print(f"\n[{mainMinion}]\n{answer}")
+        results = await self.orchestrator.arun(mainMinion, clarifiedGoal, verbose=verbose, plan=plan)
+        return mainMinion, results
+
+    def processInput(self, userGoal, verbose=False, onToken=None):
+        """
+        Run the goal and return the final minion answer.
+        If onToken is given, the answer is also handed to it chunk by chunk as it streams in.
+        """
+        mainMinion, results = self.gatherResults(userGoal, verbose=verbose)
+        prompt = self.answerPrompt(userGoal, results)
+        if onToken is None:
+            answer = self.minionTool.run("You are a helpful minion.", prompt)
+            print(f"\n[{mainMinion}]\n{answer}")
+        else:
+            print(f"\n[{mainMinion}]")
+            answer = "".join(self.relayTokens(self.minionTool.stream("You are a helpful minion.", prompt), onToken))
+        return f"[{mainMinion}] {answer}\n"
+
+    async def aprocessInput(self, userGoal, verbose=False, onToken=None):
+        mainMinion, results = await self.agatherResults(userGoal, verbose=verbose)
+        prompt = self.answerPrompt(userGoal, results)
+        if onToken is None:
+            answer = await self.minionTool.arun("You are a helpful minion.", prompt)
+            print(f"\n[{mainMinion}]\n{answer}")
+        else:
+            print(f"\n[{mainMinion}]")
+            chunks = []
+            async for chunk in self.minionTool.astream("You are a helpful minion.", prompt):
+                chunks.append(chunk)
+                onToken(chunk)
+            answer = "".join(chunks)
         return f"[{mainMinion}] {answer}\n"
@@ -1,5 +1,7 @@
 
 import logging
+import inspect
+import argparse
 import importlib
 
 logging.basicConfig(
@@ -9,6 +11,7 @@ logging.basicConfig(
 )
 
 VERBOSE = True
+STREAM  = True  # Render the final answer token by token as it is generated
 
 CHOICE_MAP = {
     1: "Basic Minions",
@@ -23,6 +26,9 @@ PROCESS_MAP = {
     
 }
 
+def printToken(token):
+    print(token, end="", flush=True)
+
 def selectMinion():
     print("\nAutonomous Minions Demo System\n" + "-" * 30)
     print("Available Minion types:")
@@ -50,7 +56,35 @@ def selectMinion():
         except (ValueError, KeyError, ImportError) as e:
             print(f"Invalid choice or import error: {e}")
 
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Autonomous Minions Demo System")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP server instead of the interactive prompt")
+    parser.add_argument("--host", help="Server host (default: MINION_SERVER_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Server port (default: MINION_SERVER_PORT or 8080)")
+    parser.add_argument("--batch", metavar="GOALS", help="Run every goal in a JSONL file ('-' for stdin) and exit")
+    parser.add_argument("--minion", default="1", help="Minion type for --batch, by number or name (default: 1)")
+    parser.add_argument("--workers", type=int, help="Goals run at once in --batch (default: BATCH_WORKERS or 8)")
+    parser.add_argument("--output", default="batchResults.jsonl", help="JSONL results for --batch, reruns resume from it")
+    return parser.parse_args()
+
+def runBatch(args):
+    from Utils.MinionBatch import MinionBatch
+    from Utils.MinionServer import resolveChoice
+    choiceStr = resolveChoice(PROCESS_MAP, CHOICE_MAP, args.minion)
+    if choiceStr is None:
+        raise SystemExit(f"Unknown minion {args.minion!r}, pick one of {list(CHOICE_MAP.values())}")
+    modulePath, _ = PROCESS_MAP[choiceStr]
+    MinionBatch(choiceStr, modulePath, workers=args.workers).run(args.batch, args.output)
+
 if __name__ == "__main__":
+    args = parseArgs()
+    if args.serve:
+        from Utils.MinionServer import MinionServer
+        MinionServer(PROCESS_MAP, CHOICE_MAP, host=args.host, port=args.port).run()
+        raise SystemExit
+    if args.batch:
+        runBatch(args)
+        raise SystemExit
     processInput, agent = selectMinion()
     print("-" * 30)
     while True:
@@ -64,7 +98,11 @@ if __name__ == "__main__":
             continue
         print(f"\n[User Input]: {userInput}\n")
         try:
-            processInput(userInput, VERBOSE)
+            if STREAM and "onToken" in inspect.signature(processInput).parameters:
+                processInput(userInput, VERBOSE, onToken=printToken)
+                print()
+            else:
+                processInput(userInput, VERBOSE)
         except Exception as e:
             logging.exception("Error during processing:")
 
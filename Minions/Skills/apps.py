@@ -48,7 +48,8 @@ class Apps:
     def _metaData(self):
         return {
             "className": f"{self.__class__.__name__}", 
-            "description": "Open and close applications on my computer"
+            "description": "Open and close applications on my computer",
+            "cachePolicy": None  # Opening/closing apps is a side effect, always run it
         }
 
     def appSkill(self, action: str, *args):
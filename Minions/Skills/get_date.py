@@ -4,6 +4,8 @@ from SkillLink import ArgumentParser
 
 argParser = ArgumentParser()
 
+CACHE_POLICY = None  # Never reuse results, the clock moves on
+
 def get_current_date():
     """
     Description: "Get the current date in DD-MM-YYYY format."
@@ -4,6 +4,8 @@ from SkillLink import ArgumentParser
 
 argParser = ArgumentParser()
 
+CACHE_POLICY = None  # Never reuse results, the clock moves on
+
 def get_current_time():
     """
     Description: "Get the current time in 12-hour format with am/pm"
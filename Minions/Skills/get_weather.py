@@ -1,11 +1,74 @@
-
+import os
 import json
+import time
+import threading
 import requests
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
 
 from SkillLink import ArgumentParser
 
 argParser = ArgumentParser()
 
+FORECAST_URL    = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+FORECAST_TTL    = 60          # Seconds one fetched forecast is shared by all the weather skills
+
+# Results are reused by SkillGraph for a minute, coordinates within ~1km share an entry
+CACHE_POLICY = {"ttl": 60, "roundTo": 2, "maxEntries": 256, "uncachedPrefixes": ["Could not"]}
+
+# One pooled session for every weather skill, so repeated calls reuse the TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+_forecasts    = {}  # (lat, lon) -> (fetchedAt, data)
+_inFlight     = {}  # (lat, lon) -> Future for the request currently fetching it
+_forecastLock = threading.Lock()
+
+
+def _getForecast(latitude, longitude):
+    """
+    Fetch current weather and hourly humidity for the coordinates in one request.
+    Recent forecasts are reused and concurrent callers for the same coordinates share one in-flight request.
+    """
+    key = (round(float(latitude), 4), round(float(longitude), 4))
+    with _forecastLock:
+        cached = _forecasts.get(key)
+        if cached and time.monotonic() - cached[0] < FORECAST_TTL:
+            return cached[1]
+        future = _inFlight.get(key)
+        isOwner = future is None
+        if isOwner:
+            future = Future()
+            _inFlight[key] = future
+    if not isOwner:
+        return future.result()
+
+    try:
+        response = _session.get(
+            FORECAST_URL,
+            params={
+                "latitude": latitude,
+                "longitude": longitude,
+                "current_weather": "true",
+                "hourly": "relative_humidity_2m",
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        data = response.json()
+        if "current_weather" in data:
+            with _forecastLock:
+                _forecasts[key] = (time.monotonic(), data)
+        future.set_result(data)
+        return data
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _forecastLock:
+            _inFlight.pop(key, None)
+
 
 def get_weather(latitude: float, longitude: float) -> str:
     """
@@ -13,10 +76,7 @@ def get_weather(latitude: float, longitude: float) -> str:
     Additional Information: "Provide the temperature in both Celsius and Fahrenheit."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
+    data = _getForecast(latitude, longitude)
     if "current_weather" in data and "temperature" in data["current_weather"]:
         c = data["current_weather"]["temperature"]
         f = c * 9/5 + 32
@@ -32,10 +92,7 @@ def get_humidity(latitude: float, longitude: float) -> str:
     Additional Information: "Returns humidity as a percentage."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
-    )
-    data = response.json()
+    data = _getForecast(latitude, longitude)
     try:
         # Returns current hour's humidity
         humidity = data['hourly']['relative_humidity_2m'][0]
@@ -50,10 +107,7 @@ def get_wind_speed(latitude: float, longitude: float) -> str:
     Additional Information: "Returns wind speed in meters per second (m/s)."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
+    data = _getForecast(latitude, longitude)
     try:
         wind_speed = data['current_weather']['windspeed']
         return f"Current wind speed: {wind_speed} m/s"
@@ -0,0 +1,608 @@
+import os
+import json
+import uuid
+import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+from Utils.Names import SUB_MINIONS
+from Utils.SkillGraph import SkillGraph
+from Utils.SingleFlight import SingleFlight
+from Utils.MinionTool import MinionTool
+from Utils.MinionScheduler import MinionScheduler
+from Utils.MinionMailbox import createMailbox
+
+load_dotenv()
+graph = SkillGraph()
+directDispatch = os.getenv("DIRECT_DISPATCH", "True") == "True"
+# Let the model pick skills through native function calling instead of clarify-then-parse
+toolCalling = os.getenv("TOOL_CALLING", "False") == "True"
+TOOL_PROMPT = (
+    "You are a minion. Call the tools needed to complete the task. "
+    "When several calls are needed and don't depend on each other, make them all at once."
+)
+ROUNDS = 10  # Upper bound on message-drain passes, guards against minions delegating back and forth
+
+
+class BaseSubMinion:
+    """
+    Clarifying shared by every caller's SubMinion, which provides self.minionTool.
+    """
+    def directStep(self, task):
+        """
+        Return the validated actions when the task already is a valid skill call, skipping the clarify round trip.
+        """
+        actions = graph.getDirectActions(task) if directDispatch else []
+        return "\n".join(actions) or None
+
+    def usableToolCalls(self, calls):
+        """
+        Keep the tool calls of a turn, or its text when the model spelled the actions out there instead.
+        Returns None when neither holds an action, so the task is clarified as text.
+        """
+        if isinstance(calls, list):
+            return calls or None
+        actions = graph.getDirectActions(calls) if calls else []
+        return "\n".join(actions) or None
+
+    def clarify(self, task, prompt=None):
+        """
+        Turn a task into something executable: the task itself when it already is a skill call,
+        otherwise [(name, args)] tool calls in tool-calling mode, or the clarified action text.
+        """
+        direct = self.directStep(task)
+        if direct:
+            return direct
+        if toolCalling:
+            calls = self.usableToolCalls(self.minionTool.runTools(TOOL_PROMPT, prompt or task))
+            if calls:
+                return calls
+        return self.minionTool.run(graph.skillInstructions(), prompt or task)
+
+    async def aclarify(self, task, prompt=None):
+        direct = self.directStep(task)
+        if direct:
+            return direct
+        if toolCalling:
+            calls = self.usableToolCalls(await self.minionTool.arunTools(TOOL_PROMPT, prompt or task))
+            if calls:
+                return calls
+        return await self.minionTool.arun(graph.skillInstructions(), prompt or task)
+
+
+class BaseOrchestrator:
+    """
+    Planning shared by every caller's OrchestratorMinion, which provides self.minionTool.
+    """
+    def decomposePrompt(self, userGoal):
+        return (
+            "Given the following available actions:\n"
+            f"{graph.getActionList()}\n"
+            "If the goal can be answered directly without calling any of these actions, say 'NO ACTIONS NEEDED'.\n"
+            "Otherwise, break down the goal into the MINIMUM number of direct function calls, each matching exactly one of the available actions. "
+            "If an action can't be matched directly, SKIP that step. "
+            "Do NOT include high-level or abstract instructions. "
+            "Just output a bullet list, one per function call, e.g.:\n"
+            "- get_temperature(47.6588, -117.4260)\n"
+            f"Goal: {userGoal}"
+        )
+
+    def parseSteps(self, stepsText):
+        return [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
+
+    def needsDirectAnswer(self, steps):
+        stepsClean = [s.lower().strip() for s in steps]
+        return not steps or any("no action" in s for s in stepsClean)
+
+    def directAnswerPrompt(self, userGoal):
+        return (
+            "You are a helpful minion who answers questions directly if no tools/actions are required.",
+            f"Answer this question in a fun minion way: \"{userGoal}\". Always end with a minion quote like: 'Bello!'"
+        )
+
+    def dedupeSteps(self, steps):
+        """
+        Collapse steps that canonicalize to the same call.
+        Returns the unique steps and, for every original step, the index of the unique step that serves it.
+        """
+        uniqueSteps, seen, stepIndex = [], {}, []
+        for step in steps:
+            key = graph.canonicalAction(step)
+            if key not in seen:
+                seen[key] = len(uniqueSteps)
+                uniqueSteps.append(step)
+            stepIndex.append(seen[key])
+        return uniqueSteps, stepIndex
+
+    def decomposeSteps(self, userGoal):
+        stepsText = self.minionTool.run("You are an expert orchestrator minion.", self.decomposePrompt(userGoal))
+        return self.parseSteps(stepsText)
+
+    async def adecomposeSteps(self, userGoal):
+        stepsText = await self.minionTool.arun("You are an expert orchestrator minion.", self.decomposePrompt(userGoal))
+        return self.parseSteps(stepsText)
+
+    def planPrompt(self, userGoal):
+        return (
+            "Given the following available actions:\n"
+            f"{graph.getActionList()}\n"
+            "First restate the user goal as a single clear task. "
+            "If the goal can be answered directly without calling any of these actions, answer it in a fun minion way "
+            "and always end with a minion quote like: 'Bello!'. "
+            "Otherwise, break down the goal into the MINIMUM number of direct function calls, each matching exactly one of the available actions. "
+            "If an action can't be matched directly, SKIP that step. "
+            "Do NOT include high-level or abstract instructions.\n"
+            "Only respond with a JSON object like:\n"
+            '{"goal": "<restated task>", "noActionsNeeded": false, "answer": "", "steps": ["get_temperature(47.6588, -117.4260)"]}\n'
+            'or {"goal": "<restated task>", "noActionsNeeded": true, "answer": "<your direct answer>", "steps": []}\n'
+            f"User Goal: {userGoal}"
+        )
+
+    def parsePlan(self, planText):
+        """
+        Parse the fused planning answer into {"goal", "answer", "steps"}.
+        Returns None when the answer is not a usable plan.
+        """
+        try:
+            parsed = json.loads(planText[planText.index("{"):planText.rindex("}") + 1])
+        except ValueError:
+            return None
+        if not isinstance(parsed, dict) or not str(parsed.get("goal") or "").strip():
+            return None
+        steps = parsed.get("steps") or []
+        if not isinstance(steps, list):
+            return None
+        steps = self.parseSteps("\n".join(str(step) for step in steps))
+        if parsed.get("noActionsNeeded"):
+            steps = []
+        return {
+            "goal": str(parsed["goal"]).strip(),
+            "answer": str(parsed.get("answer") or "").strip() if not steps else "",
+            "steps": steps,
+        }
+
+    def plan(self, userGoal):
+        """
+        Restate the goal and decompose it (or answer it directly) in a single LLM call.
+        """
+        return self.parsePlan(self.minionTool.run("You are an expert orchestrator minion.", self.planPrompt(userGoal)))
+
+    async def aplan(self, userGoal):
+        return self.parsePlan(await self.minionTool.arun("You are an expert orchestrator minion.", self.planPrompt(userGoal)))
+
+
+class BaseMainMinion:
+    """
+    Prompts and streaming shared by every caller's MainMinion, which provides self.minionTool and gatherResults.
+    """
+    def restatePrompt(self, userGoal):
+        return (
+            "You are a helpful minion. Restate the following user goal as a single clear task.\n"
+            f"User Goal: {userGoal}"
+        )
+
+    def answerPrompt(self, userGoal, results):
+        resultsSummary = "\n".join(
+            f"{r['step']}: {r['result']}" for r in results
+        )
+        minionPersonality = (
+            "Respond as if you are a Minion from the Minions movie. "
+            "Be silly, use funny minion phrases, sound happy, and always end with a minion quote! "
+            "Example ending: 'Bello!'\n"
+            "Mix some minion language (like 'banana', 'bello', 'poopaye', etc) with your answer, but still answer the user's question clearly.\n"
+        )
+        return (
+            f"{minionPersonality}"
+            f"User originally asked: \"{userGoal}\"\n"
+            f"Here are the results for that request:\n{resultsSummary}\n"
+            "Write your response now!"
+        )
+
+    def relayTokens(self, chunks, onToken):
+        for chunk in chunks:
+            onToken(chunk)
+            yield chunk
+
+    def streamInput(self, userGoal, verbose=False):
+        """
+        Generator version of processInput that yields the final answer as it is generated.
+        """
+        mainMinion, results = self.gatherResults(userGoal, verbose=verbose)
+        yield f"[{mainMinion}] "
+        yield from self.minionTool.stream("You are a helpful minion.", self.answerPrompt(userGoal, results))
+
+    async def astreamInput(self, userGoal, verbose=False):
+        mainMinion, results = await self.agatherResults(userGoal, verbose=verbose)
+        yield f"[{mainMinion}] "
+        async for chunk in self.minionTool.astream("You are a helpful minion.", self.answerPrompt(userGoal, results)):
+            yield chunk
+
+
+class MinionMessageBus:
+    def __init__(self, busId=None):
+        # MINION_BUS picks the backend, "process" lets minions in worker processes share the mailboxes,
+        # other processes reach this bus with connectMailbox(MINION_BUS_ADDRESS, busId)
+        self.busId = busId or uuid.uuid4().hex
+        self.mailbox = createMailbox(busId=self.busId)
+
+    def send(self, fromAgent, toAgent, content):
+        self.mailbox.send(fromAgent, toAgent, content)
+
+    def receive(self, minionName, allowedFrom=None, timeout=None):
+        return self.mailbox.receive(minionName, allowedFrom, timeout)
+
+    def register(self, *minionNames):
+        self.mailbox.register(*minionNames)
+
+    def clear(self):
+        self.mailbox.clear()
+
+    def pending(self, minionName=None):
+        return self.mailbox.pending(minionName)
+
+    def withMail(self, minionNames):
+        return self.mailbox.withMail(minionNames)
+
+    def waitForMail(self, minionNames, timeout=None):
+        return self.mailbox.waitForMail(minionNames, timeout)
+
+
+class BaseBusSubMinion(BaseSubMinion):
+    """
+    Sub-minion that talks to its team over a MinionMessageBus: it receives the results it depends on,
+    may delegate its step to a fellow minion and broadcasts when it is done.
+    The narrate* hooks print, callers override them to narrate differently.
+    """
+    def __init__(self, task, minionName, messageBus, flight=None):
+        self.minionTool = MinionTool()
+        self.task = task
+        self.minionName = minionName
+        self.bus = messageBus
+        self.flight = flight
+        self.result = None
+        self.state = {}
+        self.finished = set()
+        self.completed = False
+        self.subMinionTasks = None
+        self.dependencies = None
+        self.delegatedTo = None
+
+    def sendMessage(self, to, content):
+        self.bus.send(self.minionName, to, content)
+
+    def receiveMessages(self):
+        return self.bus.receive(self.minionName)
+
+    def dependencyPrompt(self):
+        if not self.subMinionTasks or len(self.subMinionTasks) <= 1:
+            return None
+        myTask = self.task
+        otherTasks = [
+            f"{name}: {task}"
+            for name, task in self.subMinionTasks.items() if name != self.minionName
+        ]
+        return (
+            f"You are a minion. Your current task is:\n{myTask}\n"
+            f"Here are the tasks of your fellow minions:\n" +
+            "\n".join(otherTasks) +
+            "\n\nList the NAMES of any minions whose task you need to see before completing your own. "
+            "Only respond with a comma-separated list of minion names. If none, respond with NONE."
+        )
+
+    def parseDependencies(self, answer):
+        return [n.strip() for n in answer.split(",") if n.strip() and n.strip().upper() != "NONE"]
+
+    def needsDataFrom(self):
+        if self.dependencies is not None:
+            return self.dependencies.get(self.minionName, [])
+        prompt = self.dependencyPrompt()
+        if prompt is None:
+            return []
+        answer = self.minionTool.run(
+            "You are a minion determining your dependencies.",
+            prompt
+        )
+        return self.parseDependencies(answer)
+
+    async def aneedsDataFrom(self):
+        if self.dependencies is not None:
+            return self.dependencies.get(self.minionName, [])
+        prompt = self.dependencyPrompt()
+        if prompt is None:
+            return []
+        answer = await self.minionTool.arun(
+            "You are a minion determining your dependencies.",
+            prompt
+        )
+        return self.parseDependencies(answer)
+
+    def maybeDelegate(self):
+        # Only allow delegation if there are at least 3 minions (prevents infinite loops on two)
+        if self.subMinionTasks and len(self.subMinionTasks) > 2 and random.random() < 0.80:
+            others = [name for name in self.subMinionTasks if name != self.minionName]
+            if others:
+                chosen = random.choice(others)
+                # Prevent delegating back and forth endlessly
+                if self.delegatedTo == chosen:
+                    return False
+                self.delegatedTo = chosen
+                self.sendMessage(chosen, f"Bello! Me want {self.task}! You do, okie dokie? Banana!")
+                self.completed = True
+                self.result = f"Delegated to {chosen} Bello!"
+                return True
+        return False
+
+    def executeTask(self, clarified):
+        if isinstance(clarified, list):
+            results = graph.executeToolCalls(clarified, flight=self.flight)
+        else:
+            actions = graph.getActions(clarified)
+            allSkills = graph.getMinionActions()
+            results = graph.executeActions(allSkills, actions, flight=self.flight)
+        filtered = [str(r) for r in results if r]
+        return "\n".join(filtered)
+
+    def stepPrompt(self):
+        inputs = [content.strip() for content in self.state.values() if "Here's" in content]
+        if not inputs:
+            return self.task
+        return f"{self.task}\nResults from fellow minions:\n" + "\n".join(inputs)
+
+    def runStep(self, verbose=False):
+        if not self.completed and not self.maybeDelegate():
+            clarified = self.clarify(self.task, self.stepPrompt())
+            self.finishStep(clarified, verbose=verbose)
+
+    async def arunStep(self, verbose=False):
+        if not self.completed and not self.maybeDelegate():
+            clarified = await self.aclarify(self.task, self.stepPrompt())
+            # Skills do blocking I/O, so they run off the event loop
+            await asyncio.to_thread(self.finishStep, clarified, verbose)
+
+    def finishStep(self, clarified, verbose=False):
+        self.narrateStep(clarified, verbose)
+        finalResult = self.executeTask(clarified)
+        self.narrateResult(finalResult, verbose)
+        self.result = finalResult or "No action result."
+        self.completed = True
+        self.sendMessage(None, f"Done with: {self.task} Bello!")
+
+    def processMessages(self, verbose=False):
+        newMessages = self.receiveMessages()
+        for m in newMessages:
+            task = self.handleMessage(m, verbose=verbose)
+            if task:
+                clarified = self.clarify(task)
+                self.finishLazyTask(m, task, clarified)
+        return len(newMessages)
+
+    async def aprocessMessages(self, verbose=False):
+        newMessages = self.receiveMessages()
+        for m in newMessages:
+            task = self.handleMessage(m, verbose=verbose)
+            if task:
+                clarified = await self.aclarify(task)
+                await asyncio.to_thread(self.finishLazyTask, m, task, clarified)
+        return len(newMessages)
+
+    def handleMessage(self, m, verbose=False):
+        """
+        Handle a single bus message.
+        Returns the delegated task when the message asks this minion to do someone else's work.
+        """
+        self.narrateMessage(m, verbose)
+        if "Me want" in m['content']:
+            task = m['content'].split("Me want", 1)[-1].strip()
+            if "!" in task:
+                task = task.split("!", 1)[0].strip()
+            return task
+        elif "Done with" in m['content']:
+            # Broadcasts only mark the sender finished, they must not overwrite a result it sent this minion
+            self.finished.add(m['from'])
+        elif "Here's" in m['content'] or "Did your lazy task" in m['content']:
+            self.state[m['from']] = m['content']
+        return None
+
+    def finishLazyTask(self, m, task, clarified):
+        finalResult = self.executeTask(clarified)
+        reply = f"Did your lazy task: {task}\nResult: {finalResult or 'No action result.'} Bello!"
+        self.sendMessage(m['from'], reply)
+
+    # ----- Narration -----
+    def narrateStep(self, clarified, verbose=False):
+        if verbose:
+            print(f"\n[{self.minionName}] Clarified action: {clarified}")
+
+    def narrateResult(self, finalResult, verbose=False):
+        if verbose:
+            print(f"Executed actions, got:\n{finalResult}")
+
+    def narrateMessage(self, m, verbose=False):
+        if verbose:
+            print(f"\n[{self.minionName}] Message from {m['from']}: {m['content']}")
+
+
+class BaseBusOrchestrator(BaseOrchestrator):
+    """
+    Orchestrator that runs one bus sub-minion per unique step, discovers their dependencies in one batched call
+    and schedules them with MinionScheduler, handing every result to the minions that need it.
+    Callers set subMinionClass (and busClass) and may override the narrate* hooks.
+    """
+    subMinionClass = BaseBusSubMinion
+    busClass = MinionMessageBus
+
+    def __init__(self, maxWorkers=None):
+        self.minionTool = MinionTool()
+        self.bus = self.busClass()
+        self.subagents = {}
+        self.stepOwners = []
+        self.maxWorkers = maxWorkers or int(os.getenv("MAX_MINION_WORKERS", "4"))
+
+    def spawnSubagents(self, steps):
+        # Identical steps and tool calls within this goal run once and share their result
+        flight = SingleFlight()
+        uniqueSteps, stepIndex = self.dedupeSteps(steps)
+        self.subagents = {}
+        self.bus.clear()
+        subagentTasks = {}
+        for i, step in enumerate(uniqueSteps, 1):
+            subMinionName = SUB_MINIONS[(i - 1) % len(SUB_MINIONS)]
+            self.subagents[subMinionName] = self.subMinionClass(step, subMinionName, messageBus=self.bus, flight=flight)
+            subagentTasks[subMinionName] = step
+        names = list(self.subagents)
+        # Every minion gets a mailbox up front so "Done with" broadcasts reach all of them
+        self.bus.register(*names)
+        self.stepOwners = [(step, names[i]) for step, i in zip(steps, stepIndex)]
+
+        for agent in self.subagents.values():
+            agent.subMinionTasks = subagentTasks
+
+    def dependencyPrompt(self):
+        tasks = "\n".join(f"{name}: {agent.task}" for name, agent in self.subagents.items())
+        return (
+            f"Here are the tasks of a team of minions:\n{tasks}\n\n"
+            "For EVERY minion, list the NAMES of the other minions whose task it needs to see before completing its own. "
+            "Only respond with a JSON object mapping each minion name to a list of minion names, "
+            'e.g. {"Donny": [], "Tom": ["Donny"]}. Use an empty list if a minion needs nobody.'
+        )
+
+    def parseDependencyMap(self, answer):
+        """
+        Parse the batched dependency answer into {minionName: [names]}.
+        Returns None when the answer is not a usable JSON object.
+        """
+        try:
+            parsed = json.loads(answer[answer.index("{"):answer.rindex("}") + 1])
+        except ValueError:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+        dependencies = {}
+        for name in self.subagents:
+            needed = parsed.get(name) or []
+            if isinstance(needed, str):
+                needed = needed.split(",")
+            dependencies[name] = [
+                str(n).strip() for n in needed
+                if str(n).strip() in self.subagents and str(n).strip() != name
+            ]
+        return dependencies
+
+    def shareDependencies(self, dependencies):
+        for agent in self.subagents.values():
+            agent.dependencies = dependencies
+        return dependencies
+
+    def discoverDependencies(self):
+        """
+        Discover every minion's dependencies with a single batched LLM call.
+        Falls back to asking each minion on its own if the answer can't be parsed.
+        """
+        agents = list(self.subagents.values())
+        if len(agents) <= 1:
+            return self.shareDependencies({agent.minionName: [] for agent in agents})
+        answer = self.minionTool.run("You are a minion determining your team's dependencies.", self.dependencyPrompt())
+        dependencies = self.parseDependencyMap(answer)
+        if dependencies is None:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.maxWorkers, len(agents)))) as executor:
+                needed = list(executor.map(lambda agent: agent.needsDataFrom(), agents))
+            dependencies = {agent.minionName: deps for agent, deps in zip(agents, needed)}
+        return self.shareDependencies(dependencies)
+
+    async def adiscoverDependencies(self):
+        agents = list(self.subagents.values())
+        if len(agents) <= 1:
+            return self.shareDependencies({agent.minionName: [] for agent in agents})
+        answer = await self.minionTool.arun("You are a minion determining your team's dependencies.", self.dependencyPrompt())
+        dependencies = self.parseDependencyMap(answer)
+        if dependencies is None:
+            needed = await asyncio.gather(*(agent.aneedsDataFrom() for agent in agents))
+            dependencies = {agent.minionName: deps for agent, deps in zip(agents, needed)}
+        return self.shareDependencies(dependencies)
+
+    def shareResult(self, minionName, dependents):
+        agent = self.subagents[minionName]
+        for dependent in dependents:
+            agent.sendMessage(dependent, f"Here's my result for {agent.task}: {agent.result} Banana!")
+
+    def runAgent(self, minionName, verbose=False):
+        agent = self.subagents[minionName]
+        agent.processMessages(verbose=verbose)
+        agent.runStep(verbose=verbose)
+
+    async def arunAgent(self, minionName, verbose=False):
+        agent = self.subagents[minionName]
+        await agent.aprocessMessages(verbose=verbose)
+        await agent.arunStep(verbose=verbose)
+
+    def drainMessages(self, verbose=False):
+        # Only minions with mail are woken, draining ends as soon as every mailbox is empty
+        for _ in range(ROUNDS):
+            busy = self.bus.withMail(list(self.subagents))
+            if not busy:
+                break
+            for name in busy:
+                self.subagents[name].processMessages(verbose=verbose)
+
+    async def adrainMessages(self, verbose=False):
+        for _ in range(ROUNDS):
+            busy = self.bus.withMail(list(self.subagents))
+            if not busy:
+                break
+            await asyncio.gather(*(self.subagents[name].aprocessMessages(verbose=verbose) for name in busy))
+
+    def collectResults(self):
+        results = {}
+        for agent in self.subagents.values():
+            # Only set results to actual output, not delegated message
+            agentResult = agent.result
+            if agentResult and agentResult.startswith("Delegated to "):
+                # Try to resolve the actual result from agent.state
+                for val in agent.state.values():
+                    if "Result:" in val:
+                        agentResult = val.split("Result:")[-1].strip()
+            results[agent.minionName] = agentResult
+        # Every original step is reported, duplicates share the result of the minion that ran it
+        return [{"step": step, "result": results[minionName]} for step, minionName in self.stepOwners]
+
+    def run(self, mainMinion, userGoal, verbose=False, plan=None):
+        steps = plan["steps"] if plan else self.decomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
+            self.narrateDirect(mainMinion, verbose)
+            answer = (plan and plan["answer"]) or self.minionTool.run(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
+
+        self.spawnSubagents(steps)
+
+        self.narrateSteps(mainMinion, steps, verbose)
+
+        scheduler = MinionScheduler(self.discoverDependencies(), maxWorkers=self.maxWorkers)
+        scheduler.run(lambda name: self.runAgent(name, verbose=verbose), onDone=self.shareResult)
+        self.drainMessages(verbose=verbose)
+        return self.collectResults()
+
+    async def arun(self, mainMinion, userGoal, verbose=False, plan=None):
+        steps = plan["steps"] if plan else await self.adecomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
+            self.narrateDirect(mainMinion, verbose)
+            answer = (plan and plan["answer"]) or await self.minionTool.arun(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
+
+        self.spawnSubagents(steps)
+
+        self.narrateSteps(mainMinion, steps, verbose)
+
+        scheduler = MinionScheduler(await self.adiscoverDependencies(), maxWorkers=self.maxWorkers)
+        await scheduler.arun(lambda name: self.arunAgent(name, verbose=verbose), onDone=self.shareResult)
+        await self.adrainMessages(verbose=verbose)
+        return self.collectResults()
+
+    # ----- Narration -----
+    def narrateDirect(self, mainMinion, verbose=False):
+        if verbose:
+            print(f"\n[{mainMinion}] No subminions needed! I'll answer directly, Bello!")
+
+    def narrateSteps(self, mainMinion, steps, verbose=False):
+        if verbose:
+            print(f"\n[{mainMinion}] === Bello! Calling Minions! ===")
@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import importlib
+import contextlib
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+class MinionBatch:
+    """
+    Runs a file of goals through one caller's aprocessInput with a fixed number of async workers.
+
+    Input is JSONL, one goal per line: {"id": "q1", "goal": "..."} or just a JSON string ("id" defaults to the line number).
+    Every goal produces one JSONL result {"id", "goal", "minion", "ok", "answer", "error", "seconds", "attempts"},
+    appended to the output file the moment it finishes. Ids that already have an ok result in the output are skipped,
+    so an interrupted batch picks up where it stopped, and failed goals are retried on the next run.
+    Each worker owns its MainMinion, skills and provider clients are shared, so throughput is bounded by the provider.
+    """
+    def __init__(self, choice, modulePath, workers=None, retries=None, backoff=2.0):
+        self.choice     = choice
+        self.modulePath = modulePath
+        self.workers    = max(1, int(workers or os.getenv("BATCH_WORKERS", "8")))
+        self.retries    = max(0, int(retries if retries is not None else os.getenv("BATCH_RETRIES", "2")))
+        self.backoff    = backoff
+        self.done       = 0
+        self.failed     = 0
+
+    def readGoals(self, source):
+        """Read (id, goal) pairs from a JSONL file, or stdin when source is "-"."""
+        stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        goals = []
+        with contextlib.ExitStack() as stack:
+            if stream is not sys.stdin:
+                stack.enter_context(stream)
+            for lineNumber, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping line {lineNumber}, it isn't valid JSON")
+                    continue
+                if isinstance(entry, str):
+                    entry = {"goal": entry}
+                goal = str(entry.get("goal", "")).strip() if isinstance(entry, dict) else ""
+                if not goal:
+                    logger.warning(f"Skipping line {lineNumber}, it has no goal")
+                    continue
+                goals.append((str(entry.get("id", lineNumber)), goal))
+        return goals
+
+    def completedIds(self, output):
+        """Get the ids that already have a successful result in the output file."""
+        completed = set()
+        path = Path(output)
+        if not path.exists():
+            return completed
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by the interruption
+                if result.get("ok"):
+                    completed.add(str(result.get("id")))
+        return completed
+
+    def run(self, source, output):
+        goals = self.readGoals(source)
+        completed = self.completedIds(output)
+        pending = [(goalId, goal) for goalId, goal in goals if goalId not in completed]
+        print(f"[Batch] {len(goals)} goals, {len(goals) - len(pending)} already done, "
+              f"running {len(pending)} through {self.choice} with {self.workers} workers", file=sys.stderr)
+        if not pending:
+            return
+        start = time.perf_counter()
+        with open(output, "a", encoding="utf-8") as out, open(os.devnull, "w") as quiet:
+            # Callers narrate to stdout, the results file and stderr progress are the batch's output
+            with contextlib.redirect_stdout(quiet):
+                asyncio.run(self.runAll(pending, out))
+        elapsed = time.perf_counter() - start
+        print(f"[Batch] {self.done} ok, {self.failed} failed in {elapsed:.1f}s "
+              f"({(self.done + self.failed) / elapsed:.2f} goals/s)", file=sys.stderr)
+
+    async def runAll(self, pending, out):
+        queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        total = len(pending)
+        await asyncio.gather(*(self.worker(queue, out, total) for _ in range(min(self.workers, total))))
+
+    async def worker(self, queue, out, total):
+        mainMinion = importlib.import_module(self.modulePath).MainMinion()
+        while not queue.empty():
+            goalId, goal = queue.get_nowait()
+            result = await self.runGoal(mainMinion, goalId, goal)
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if result["ok"]:
+                self.done += 1
+            else:
+                self.failed += 1
+            status = "ok" if result["ok"] else f"failed: {result['error']}"
+            print(f"[{self.done + self.failed}/{total}] {goalId} {status} ({result['seconds']}s)", file=sys.stderr)
+
+    async def runGoal(self, mainMinion, goalId, goal):
+        start = time.perf_counter()
+        answer, error, attempts = None, None, 0
+        while attempts <= self.retries:
+            attempts += 1
+            try:
+                answer = (await mainMinion.aprocessInput(goal)).strip()
+                error = None
+                break
+            except Exception as e:
+                # Mostly rate limits and timeouts, back off before trying again
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(f"Goal {goalId} failed on attempt {attempts}: {error}")
+                if attempts <= self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** (attempts - 1))
+        return {
+            "id": goalId,
+            "goal": goal,
+            "minion": self.choice,
+            "ok": error is None,
+            "answer": answer,
+            "error": error,
+            "seconds": round(time.perf_counter() - start, 3),
+            "attempts": attempts,
+        }
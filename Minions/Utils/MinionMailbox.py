@@ -0,0 +1,205 @@
+import os
+import uuid
+import weakref
+import threading
+from time import time, monotonic
+from collections import deque
+from multiprocessing.managers import BaseManager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class MinionMailbox:
+    """
+    Message bus with one indexed queue per recipient, a drop-in for AgentToAgent.
+
+    Delivery appends to the recipient's queue in O(1). A broadcast (toAgent=None) puts the same message
+    object into every registered mailbox except the sender's, the payload is never copied.
+    receive() can block on a condition variable until mail arrives, and pending() counts without consuming.
+    """
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.arrived  = threading.Condition(self.lock)  # notified on every delivery
+        self.inboxes  = {}  # recipient -> deque of messages
+
+    def register(self, *agentNames):
+        """Create mailboxes up front so broadcasts reach agents that haven't received anything yet."""
+        with self.lock:
+            for name in agentNames:
+                self.inboxes.setdefault(name, deque())
+
+    def clear(self):
+        """Drop every mailbox, a new goal starts with a fresh set of recipients."""
+        with self.lock:
+            self.inboxes.clear()
+
+    def send(self, fromAgent, toAgent, content, ttl=None):
+        """Send a message with optional Time-To-Live (seconds), toAgent=None broadcasts it."""
+        message = {
+            "from": fromAgent,
+            "to": toAgent,
+            "content": content,
+            "timestamp": time(),
+            "expiry": time() + ttl if ttl else None,
+        }
+        with self.lock:
+            if toAgent is None:
+                for name, inbox in self.inboxes.items():
+                    if name != fromAgent:
+                        inbox.append(message)
+            else:
+                self.inboxes.setdefault(toAgent, deque()).append(message)
+            self.arrived.notify_all()
+
+    def receive(self, agentName, allowedFrom=None, timeout=None):
+        """
+        Retrieve and remove all valid messages for agentName from allowed senders.
+        With a timeout, block up to that many seconds for at least one message to arrive.
+        """
+        deadline = monotonic() + timeout if timeout else None
+        with self.lock:
+            while True:
+                messages = self.take(agentName, allowedFrom)
+                remaining = deadline - monotonic() if deadline else 0
+                if messages or remaining <= 0:
+                    return messages
+                self.arrived.wait(remaining)
+
+    def take(self, agentName, allowedFrom):
+        """Pop the deliverable messages, call with self.lock held. Expired messages are discarded."""
+        inbox = self.inboxes.get(agentName)
+        if not inbox:
+            return []
+        now = time()
+        messages, kept = [], deque()
+        for m in inbox:
+            if m["expiry"] and m["expiry"] <= now:
+                continue
+            if allowedFrom is None or m["from"] in allowedFrom:
+                messages.append(m)
+            else:
+                kept.append(m)
+        self.inboxes[agentName] = kept
+        return messages
+
+    def pending(self, agentName=None):
+        """Count undelivered messages for one agent, or for everyone, without consuming them."""
+        with self.lock:
+            if agentName is not None:
+                return len(self.inboxes.get(agentName, ()))
+            return sum(len(inbox) for inbox in self.inboxes.values())
+
+    def withMail(self, agentNames):
+        """Get the agents, out of agentNames, that have mail waiting."""
+        with self.lock:
+            return [name for name in agentNames if self.inboxes.get(name)]
+
+    def waitForMail(self, agentNames, timeout=None):
+        """
+        Block until any of the agents has mail. Returns the names that do, empty if the timeout ran out.
+        """
+        with self.lock:
+            self.arrived.wait_for(lambda: any(self.inboxes.get(name) for name in agentNames), timeout)
+            return [name for name in agentNames if self.inboxes.get(name)]
+
+    def purgeExpired(self):
+        """Optionally call this to remove expired messages from all inboxes"""
+        with self.lock:
+            now = time()
+            for agent, inbox in self.inboxes.items():
+                self.inboxes[agent] = deque(m for m in inbox if not m["expiry"] or m["expiry"] > now)
+
+
+# What every bus backend exposes, the orchestrators only ever call these
+MAILBOX_METHODS = ("register", "clear", "send", "receive", "pending", "withMail", "waitForMail", "purgeExpired")
+
+
+brokerMailboxes = weakref.WeakValueDictionary()  # busId -> mailbox, kept alive by the proxies to it
+brokerLock = threading.Lock()
+
+
+def busMailbox(busId):
+    """Runs in the broker process, hands out the mailbox of one bus and creates it on first use."""
+    with brokerLock:
+        mailbox = brokerMailboxes.get(busId)
+        if mailbox is None:
+            mailbox = MinionMailbox()
+            brokerMailboxes[busId] = mailbox
+        return mailbox
+
+
+class MailboxManager(BaseManager):
+    """Serves MinionMailboxes from the broker process, every client gets picklable proxies to them."""
+
+
+MailboxManager.register("busMailbox", busMailbox, exposed=MAILBOX_METHODS)
+
+processBrokers = {}  # address -> this process's MailboxManager for it
+processBrokerLock = threading.Lock()
+
+
+def getProcessBroker(address=None, authkey=None):
+    """
+    Get this process's connection to the mailbox broker, a broker is started once per process and address.
+    When address is already served by a broker another process started, that broker is connected to instead.
+    """
+    with processBrokerLock:
+        if address in processBrokers:
+            return processBrokers[address]
+        manager = MailboxManager(address=address, authkey=authkey)
+        if address is not None:
+            try:
+                manager.connect()
+                processBrokers[address] = manager
+                return manager
+            except OSError:
+                # Nobody serves the address, a socket file left behind by a dead broker would block start()
+                if isinstance(address, str) and os.path.exists(address):
+                    os.unlink(address)
+                manager = MailboxManager(address=address, authkey=authkey)
+        manager.start()
+        processBrokers[address] = manager
+        return manager
+
+
+def startProcessMailbox(address=None, authkey=None, busId=None):
+    """
+    Get the mailbox of bus busId from the process broker and return a proxy to it.
+    The proxy can be handed to worker processes, they all share that mailbox, and it is freed with the last proxy.
+    Every bus of the process shares one broker, which shuts down when the process exits.
+    Pass a socket path (or (host, port)) as the address so processes started later reuse that broker,
+    and processes started elsewhere can connectMailbox(address, busId) to a running bus.
+    """
+    return getProcessBroker(address, authkey).busMailbox(busId or uuid.uuid4().hex)
+
+
+def connectMailbox(address, busId, authkey=None):
+    """Get a proxy to the mailbox of bus busId in the broker serving address."""
+    manager = MailboxManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.busMailbox(busId)
+
+
+MAILBOX_BACKENDS = {
+    "local": lambda address=None, authkey=None, busId=None: MinionMailbox(),
+    "process": startProcessMailbox,
+}
+
+
+def createMailbox(backend=None, address=None, busId=None):
+    """
+    Build the message bus backend named by MINION_BUS:
+        local    in-process mailboxes (default)
+        process  mailboxes in a broker process so minions in worker processes can talk to each other,
+                 busId names the bus there so other processes can connectMailbox() to it
+    """
+    backend = backend or os.getenv("MINION_BUS", "local")
+    if backend not in MAILBOX_BACKENDS:
+        raise ValueError(f"Unknown MINION_BUS backend {backend!r}, expected one of {sorted(MAILBOX_BACKENDS)}")
+    authkey = os.getenv("MINION_BUS_AUTHKEY")
+    return MAILBOX_BACKENDS[backend](
+        address=address or os.getenv("MINION_BUS_ADDRESS") or None,
+        authkey=authkey.encode() if authkey else None,
+        busId=busId,
+    )
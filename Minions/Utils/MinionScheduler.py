@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+
+class MinionScheduler:
+    """
+    Dependency-DAG scheduler for sub-minion steps.
+    Each step starts as soon as every step it depends on has finished,
+    independent steps run in parallel and the run ends when the DAG drains.
+    """
+    def __init__(self, dependencies: dict, maxWorkers: int = 4):
+        names = list(dependencies)
+        self.dependencies = {
+            name: [dep for dep in dict.fromkeys(deps or []) if dep in dependencies and dep != name]
+            for name, deps in dependencies.items()
+        }
+        self.dependents = {name: [] for name in names}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(name)
+        self.maxWorkers = max(1, maxWorkers)
+
+    def _ready(self, pending, done, running):
+        ready = [name for name in pending if all(dep in done for dep in self.dependencies[name])]
+        if not ready and not running and pending:
+            # Cycle: release the step with the fewest unresolved inputs so the DAG keeps draining
+            name = min(pending, key=lambda n: sum(dep not in done for dep in self.dependencies[n]))
+            logger.warning(f"Dependency cycle detected, running {name} without all of its inputs.")
+            ready = [name]
+        return ready
+
+    def run(self, runStep, onDone=None):
+        """
+        Run every step on a bounded thread pool.
+        runStep(name) executes a step, onDone(name, dependents) is called once it finishes.
+        """
+        pending, done, running = list(self.dependencies), set(), {}
+        with ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix="SubMinion") as executor:
+            while pending or running:
+                for name in self._ready(pending, done, set(running.values())):
+                    pending.remove(name)
+                    running[executor.submit(runStep, name)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        logger.error(f"Step {name} failed:", exc_info=True)
+                    done.add(name)
+                    if onDone:
+                        onDone(name, self.dependents[name])
+
+    async def arun(self, runStep, onDone=None):
+        """
+        Async variant of run(), runStep(name) must be a coroutine function.
+        """
+        pending, done, running = list(self.dependencies), set(), {}
+        semaphore = asyncio.Semaphore(self.maxWorkers)
+
+        async def bounded(name):
+            async with semaphore:
+                await runStep(name)
+
+        while pending or running:
+            for name in self._ready(pending, done, set(running.values())):
+                pending.remove(name)
+                running[asyncio.ensure_future(bounded(name))] = name
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                if task.exception():
+                    logger.error(f"Step {name} failed:", exc_info=task.exception())
+                done.add(name)
+                if onDone:
+                    onDone(name, self.dependents[name])
@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import importlib
+import contextlib
+from http import HTTPStatus
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+def resolveChoice(processMap, choiceMap, minion):
+    """
+    Get the caller name for a menu number, a full name like "Speaking Minions" or just its first word.
+    Nothing picks the first menu entry, an unknown minion gives None.
+    """
+    if minion is None or minion == "":
+        return choiceMap[1]
+    if isinstance(minion, int) or str(minion).isdigit():
+        return choiceMap.get(int(minion))
+    wanted = str(minion).strip().lower()
+    for choice in processMap:
+        if wanted in (choice.lower(), choice.split()[0].lower()):
+            return choice
+    return None
+
+
+class MinionServer:
+    """
+    Long-running asyncio HTTP/JSON front end for the callers' aprocessInput.
+
+    POST /run     {"goal": "...", "minion": "advanced", "stream": false, "verbose": false}
+                  Answers with {"minion", "answer", "seconds"}, or with the answer as a chunked text stream when stream is true.
+                  minion takes a menu number, a full name like "Speaking Minions" or just its first word, Basic by default.
+    GET  /health  Reports running goals and queue depth.
+
+    At most MINION_SERVER_CONCURRENCY goals run at once, later ones wait in a queue of up to MINION_SERVER_QUEUE
+    and anything beyond that is turned away with 503. SkillGraph and the provider clients are shared singletons,
+    so they stay warm across requests, and MainMinion instances are reused once a goal finishes with them.
+    Caller narration is discarded while serving, failures are logged.
+    """
+    MAX_BODY = 1 << 20
+
+    def __init__(self, processMap, choiceMap, host=None, port=None, maxConcurrent=None, maxQueue=None):
+        self.processMap    = processMap
+        self.choiceMap     = choiceMap
+        self.host          = host or os.getenv("MINION_SERVER_HOST", "127.0.0.1")
+        self.port          = int(port or os.getenv("MINION_SERVER_PORT", "8080"))
+        self.maxConcurrent = max(1, int(maxConcurrent or os.getenv("MINION_SERVER_CONCURRENCY", "8")))
+        self.maxQueue      = max(0, int(maxQueue if maxQueue is not None else os.getenv("MINION_SERVER_QUEUE", "64")))
+        self.slots         = None  # Semaphore, built on the server's event loop
+        self.idle          = {}    # choice name -> MainMinion instances not running a goal
+        self.active        = 0
+        self.queued        = 0
+        self.served        = 0
+        self.failed        = 0
+        self.rejected      = 0
+        self.startedAt     = None
+
+    # ----- Lifecycle -----
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
+
+    async def serve(self):
+        from Utils.SkillGraph import SkillGraph
+        self.slots = asyncio.Semaphore(self.maxConcurrent)
+        self.startedAt = time.monotonic()
+        # Load the skills before the first request instead of during it
+        await asyncio.to_thread(SkillGraph().getCatalog)
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"Minion server listening on http://{self.host}:{self.port} "
+              f"(concurrency {self.maxConcurrent}, queue {self.maxQueue}), Bello!")
+        # Callers narrate every goal to stdout, keep it for the server's own messages like MinionBatch does
+        with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+            async with server:
+                await server.serve_forever()
+
+    # ----- Minions -----
+    def acquireMinion(self, choice):
+        idle = self.idle.setdefault(choice, [])
+        if idle:
+            return idle.pop()
+        modulePath, _ = self.processMap[choice]
+        return importlib.import_module(modulePath).MainMinion()
+
+    def releaseMinion(self, choice, mainMinion):
+        self.idle.setdefault(choice, []).append(mainMinion)
+
+    # ----- HTTP -----
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self.readRequest(reader)
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                await self.sendJson(writer, HTTPStatus.BAD_REQUEST, {"error": str(e) or "Malformed request"})
+                return
+            if path == "/health" and method == "GET":
+                await self.sendJson(writer, HTTPStatus.OK, self.health())
+            elif path == "/run" and method == "POST":
+                await self.runGoal(writer, body)
+            elif path in ("/health", "/run"):
+                await self.sendJson(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"})
+            else:
+                await self.sendJson(writer, HTTPStatus.NOT_FOUND, {"error": f"Unknown path {path}"})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception:
+            logger.error("Error handling request:", exc_info=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def readRequest(self, reader):
+        requestLine = (await reader.readline()).decode("latin-1").split()
+        if len(requestLine) != 3:
+            raise ValueError("Malformed request line")
+        method, target, _ = requestLine
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > self.MAX_BODY:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def sendHead(self, writer, status, contentType, extra=None):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {contentType}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (extra or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def sendJson(self, writer, status, payload, extra=None):
+        data = json.dumps(payload).encode("utf-8")
+        await self.sendHead(writer, status, "application/json", {"Content-Length": len(data), **(extra or {})})
+        writer.write(data)
+        await writer.drain()
+
+    async def sendChunk(self, writer, text):
+        data = text.encode("utf-8")
+        if data:
+            writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+            await writer.drain()
+
+    def health(self):
+        return {
+            "status": "ok",
+            "active": self.active,
+            "queued": self.queued,
+            "maxConcurrent": self.maxConcurrent,
+            "maxQueue": self.maxQueue,
+            "served": self.served,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "uptime": round(time.monotonic() - self.startedAt, 1) if self.startedAt else 0,
+        }
+
+    # ----- Goals -----
+    async def runGoal(self, writer, body):
+        try:
+            request = json.loads(body or b"{}")
+            goal = str(request.get("goal", "")).strip()
+        except (ValueError, AttributeError):
+            await self.sendJson(writer, HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"})
+            return
+        if not goal:
+            await self.sendJson(writer, HTTPStatus.BAD_REQUEST, {"error": "Missing goal"})
+            return
+        choice = resolveChoice(self.processMap, self.choiceMap, request.get("minion"))
+        if choice is None:
+            await self.sendJson(writer, HTTPStatus.BAD_REQUEST, {"error": f"Unknown minion {request.get('minion')!r}"})
+            return
+        if self.active >= self.maxConcurrent and self.queued >= self.maxQueue:
+            self.rejected += 1
+            await self.sendJson(writer, HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many goals queued"}, {"Retry-After": 1})
+            return
+
+        self.queued += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.queued -= 1
+        self.active += 1
+        try:
+            mainMinion = self.acquireMinion(choice)
+            verbose = bool(request.get("verbose", False))
+            if request.get("stream"):
+                await self.streamGoal(writer, mainMinion, goal, verbose)
+            else:
+                await self.answerGoal(writer, mainMinion, choice, goal, verbose)
+            self.releaseMinion(choice, mainMinion)
+        finally:
+            self.active -= 1
+            self.slots.release()
+
+    async def answerGoal(self, writer, mainMinion, choice, goal, verbose):
+        start = time.perf_counter()
+        try:
+            answer = await mainMinion.aprocessInput(goal, verbose)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Goal failed: {goal}", exc_info=True)
+            await self.sendJson(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        self.served += 1
+        await self.sendJson(writer, HTTPStatus.OK, {
+            "minion": choice,
+            "answer": answer.strip(),
+            "seconds": round(time.perf_counter() - start, 3),
+        })
+
+    async def streamGoal(self, writer, mainMinion, goal, verbose):
+        await self.sendHead(writer, HTTPStatus.OK, "text/plain; charset=utf-8", {"Transfer-Encoding": "chunked"})
+        try:
+            async for chunk in mainMinion.astreamInput(goal, verbose):
+                await self.sendChunk(writer, chunk)
+            self.served += 1
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            # Headers are already out, so the failure is reported in the body
+            self.failed += 1
+            logger.error(f"Goal failed: {goal}", exc_info=True)
+            await self.sendChunk(writer, f"\n[Error] {e}\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
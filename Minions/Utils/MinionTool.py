@@ -0,0 +1,218 @@
+import os
+from dotenv import load_dotenv
+
+from Utils.SkillGraph import SkillGraph
+from Utils.ResponseCache import ResponseCache
+from Utils.ProviderClients import ProviderClients
+from Utils.ProviderCassette import ProviderCassette
+from Utils.ToolSchemas import JsonSchemaManager, TypedSchemaManager
+
+load_dotenv()
+# Provider clients and skills are built on first use, so importing a caller stays cheap
+clients = ProviderClients()
+
+graph = SkillGraph()
+jsonTools   = JsonSchemaManager()
+typedTools  = TypedSchemaManager()
+
+
+class MinionTool:
+    def __init__(self):
+        self.provider = os.getenv("PROVIDER", "openai")
+        self.cache    = ResponseCache()
+        self.cassette = ProviderCassette()
+        self.modelMap = {
+            "openai": "gpt-4.1-mini",
+            "google": "gemini-2.5-flash-preview-04-17",
+        }
+        self.providerMap = {
+            "openai": self.runOpenai,
+            "google": self.runGoogle,
+            "replay": self.cassette.replay,
+        }
+        self.asyncProviderMap = {
+            "openai": self.arunOpenai,
+            "google": self.arunGoogle,
+            "replay": self.cassette.areplay,
+        }
+        self.streamProviderMap = {
+            "openai": self.streamOpenai,
+            "google": self.streamGoogle,
+            "replay": self.cassette.replayStream,
+        }
+        self.asyncStreamProviderMap = {
+            "openai": self.astreamOpenai,
+            "google": self.astreamGoogle,
+            "replay": self.cassette.areplayStream,
+        }
+        self.toolProviderMap = {
+            "openai": self.runOpenaiTools,
+            "google": self.runGoogleTools,
+            "replay": self.cassette.replayTools,
+        }
+        self.asyncToolProviderMap = {
+            "openai": self.arunOpenaiTools,
+            "google": self.arunGoogleTools,
+            "replay": self.cassette.areplayTools,
+        }
+        # With LLM_RECORD=True every real exchange is appended to the cassette for PROVIDER=replay
+        self.cassette.recordTool(self)
+
+    def getProvider(self, providerMap):
+        try:
+            return providerMap[self.provider]
+        except KeyError:
+            raise ValueError("Invalid LLM provider. Use 'openai', 'google' or 'replay'.")
+
+    def cacheKey(self, systemMsg, userMsg):
+        return self.cache.makeKey(self.provider, self.modelMap.get(self.provider), systemMsg, userMsg)
+
+    def run(self, systemMsg, userMsg, useCache=True):
+        key = self.cacheKey(systemMsg, userMsg) if useCache else None
+        cached = self.cache.get(key) if useCache else None
+        if cached is not None:
+            return cached
+        response = self.getProvider(self.providerMap)(systemMsg, userMsg)
+        if useCache:
+            self.cache.put(key, response)
+        return response
+
+    async def arun(self, systemMsg, userMsg, useCache=True):
+        key = self.cacheKey(systemMsg, userMsg) if useCache else None
+        cached = self.cache.get(key) if useCache else None
+        if cached is not None:
+            return cached
+        response = await self.getProvider(self.asyncProviderMap)(systemMsg, userMsg)
+        if useCache:
+            self.cache.put(key, response)
+        return response
+
+    def stream(self, systemMsg, userMsg, useCache=True):
+        """
+        Yield the response in text chunks as the provider generates it.
+        The full text is cached once the stream completes.
+        """
+        key = self.cacheKey(systemMsg, userMsg) if useCache else None
+        cached = self.cache.get(key) if useCache else None
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        for chunk in self.getProvider(self.streamProviderMap)(systemMsg, userMsg):
+            chunks.append(chunk)
+            yield chunk
+        if useCache:
+            self.cache.put(key, "".join(chunks))
+
+    async def astream(self, systemMsg, userMsg, useCache=True):
+        key = self.cacheKey(systemMsg, userMsg) if useCache else None
+        cached = self.cache.get(key) if useCache else None
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        async for chunk in self.getProvider(self.asyncStreamProviderMap)(systemMsg, userMsg):
+            chunks.append(chunk)
+            yield chunk
+        if useCache:
+            self.cache.put(key, "".join(chunks))
+
+    def runTools(self, systemMsg, userMsg):
+        """
+        Let the model pick skills through native function calling.
+        Returns [(name, args)] for every tool call of the turn, the model may call several at once,
+        or the text of the turn when the model answered without calling any tool.
+        """
+        return self.getProvider(self.toolProviderMap)(systemMsg, userMsg)
+
+    async def arunTools(self, systemMsg, userMsg):
+        return await self.getProvider(self.asyncToolProviderMap)(systemMsg, userMsg)
+
+    def openaiRequest(self, systemMsg, userMsg):
+        prompt = [
+            graph.handleJsonFormat("system", systemMsg),
+            graph.handleJsonFormat("user", userMsg)
+        ]
+        return {"model": self.modelMap["openai"], "messages": prompt}
+
+    def googleRequest(self, systemMsg, userMsg):
+        system = [graph.handleTypedFormat("system", systemMsg)]
+        contents = [graph.handleTypedFormat("user", userMsg)]
+
+        generateContentConfig = clients.getGoogleTypes().GenerateContentConfig(
+            response_mime_type="text/plain",
+            system_instruction=system,  # List of Parts
+        )
+        return {"model": self.modelMap["google"], "contents": contents, "config": generateContentConfig}
+
+    def googleToolRequest(self, systemMsg, userMsg):
+        types = clients.getGoogleTypes()
+        system = [graph.handleTypedFormat("system", systemMsg)]
+        contents = [graph.handleTypedFormat("user", userMsg)]
+
+        generateContentConfig = types.GenerateContentConfig(
+            system_instruction=system,
+            tools=typedTools.getToolSchemas(),
+            # Calls are executed by SkillGraph, in parallel and through the skill cache
+            automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True),
+        )
+        return {"model": self.modelMap["google"], "contents": contents, "config": generateContentConfig}
+
+    def runOpenai(self, systemMsg, userMsg):
+        return clients.getOpenai().chat.completions.create(
+            **self.openaiRequest(systemMsg, userMsg)
+        ).choices[0].message.content
+
+    async def arunOpenai(self, systemMsg, userMsg):
+        response = await clients.getAsyncOpenai().chat.completions.create(**self.openaiRequest(systemMsg, userMsg))
+        return response.choices[0].message.content
+
+    def streamOpenai(self, systemMsg, userMsg):
+        for chunk in clients.getOpenai().chat.completions.create(**self.openaiRequest(systemMsg, userMsg), stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astreamOpenai(self, systemMsg, userMsg):
+        stream = await clients.getAsyncOpenai().chat.completions.create(**self.openaiRequest(systemMsg, userMsg), stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def runOpenaiTools(self, systemMsg, userMsg):
+        response = clients.getOpenai().chat.completions.create(
+            **self.openaiRequest(systemMsg, userMsg), tools=jsonTools.getToolSchemas(), parallel_tool_calls=True
+        )
+        message = response.choices[0].message
+        return jsonTools.parseToolCalls(message) or (message.content or "")
+
+    async def arunOpenaiTools(self, systemMsg, userMsg):
+        response = await clients.getAsyncOpenai().chat.completions.create(
+            **self.openaiRequest(systemMsg, userMsg), tools=jsonTools.getToolSchemas(), parallel_tool_calls=True
+        )
+        message = response.choices[0].message
+        return jsonTools.parseToolCalls(message) or (message.content or "")
+
+    def runGoogle(self, systemMsg, userMsg):
+        return clients.getGoogle().models.generate_content(**self.googleRequest(systemMsg, userMsg)).text
+
+    async def arunGoogle(self, systemMsg, userMsg):
+        response = await clients.getAsyncGoogle().aio.models.generate_content(**self.googleRequest(systemMsg, userMsg))
+        return response.text
+
+    def streamGoogle(self, systemMsg, userMsg):
+        for chunk in clients.getGoogle().models.generate_content_stream(**self.googleRequest(systemMsg, userMsg)):
+            if chunk.text:
+                yield chunk.text
+
+    def runGoogleTools(self, systemMsg, userMsg):
+        response = clients.getGoogle().models.generate_content(**self.googleToolRequest(systemMsg, userMsg))
+        return typedTools.parseToolCalls(response) or (response.text or "")
+
+    async def arunGoogleTools(self, systemMsg, userMsg):
+        response = await clients.getAsyncGoogle().aio.models.generate_content(**self.googleToolRequest(systemMsg, userMsg))
+        return typedTools.parseToolCalls(response) or (response.text or "")
+
+    async def astreamGoogle(self, systemMsg, userMsg):
+        async for chunk in await clients.getAsyncGoogle().aio.models.generate_content_stream(**self.googleRequest(systemMsg, userMsg)):
+            if chunk.text:
+                yield chunk.text
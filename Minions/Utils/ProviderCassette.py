@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+class ProviderCassette:
+    """
+    Records LLM exchanges to a JSONL cassette and replays them offline.
+
+    With LLM_RECORD=True every (system, user) -> response exchange made through a real provider is appended to
+    LLM_CASSETTE, together with how long it took. PROVIDER=replay then serves the responses from the cassette,
+    instantly or, with LLM_REPLAY_LATENCY=recorded, after the recorded delay. A prompt asked several times
+    replays its recorded answers in order, repeating the last one once they run out.
+    Text and streamed calls share recordings, tool calls are kept apart. A prompt that was never recorded raises LookupError.
+    Delegation between minions is random, so both modes seed random with LLM_CASSETTE_SEED to take the same paths.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(ProviderCassette, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.path          = Path(os.getenv('LLM_CASSETTE') or '.llmCassette.jsonl')
+        self.recording     = os.getenv('LLM_RECORD', 'False') == 'True'
+        self.replaying     = os.getenv('PROVIDER', 'openai') == 'replay'
+        self.replayLatency = os.getenv('LLM_REPLAY_LATENCY', 'zero') == 'recorded'
+        self.cassetteLock  = threading.Lock()
+        self.tracks        = None  # key -> recorded exchanges, loaded on the first replay
+        self.played        = {}    # key -> exchanges replayed so far
+        if self.recording and self.replaying:
+            logger.warning("LLM_RECORD is ignored while PROVIDER=replay, nothing new would be recorded")
+            self.recording = False
+        if self.recording or self.replaying:
+            random.seed(os.getenv('LLM_CASSETTE_SEED', '0'))
+
+    def makeKey(self, kind, systemMsg, userMsg):
+        raw = json.dumps(["tools" if kind == "tools" else "text", systemMsg, userMsg], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    # ----- Recording -----
+    def record(self, kind, provider, systemMsg, userMsg, response, seconds):
+        entry = {
+            "key": self.makeKey(kind, systemMsg, userMsg),
+            "kind": kind,
+            "provider": provider,
+            "system": systemMsg,
+            "user": userMsg,
+            "response": response,
+            "seconds": round(seconds, 4),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.cassetteLock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                logger.warning(f"Could not record to the LLM cassette {self.path}:", exc_info=True)
+
+    def recordTool(self, minionTool):
+        """Wrap every real provider of a MinionTool so its exchanges are recorded."""
+        if not self.recording:
+            return
+        wrappers = (
+            (minionTool.providerMap, "text", self.recordCall),
+            (minionTool.asyncProviderMap, "text", self.arecordCall),
+            (minionTool.streamProviderMap, "stream", self.recordStream),
+            (minionTool.asyncStreamProviderMap, "stream", self.arecordStream),
+            (minionTool.toolProviderMap, "tools", self.recordCall),
+            (minionTool.asyncToolProviderMap, "tools", self.arecordCall),
+        )
+        for providerMap, kind, wrap in wrappers:
+            for provider, func in list(providerMap.items()):
+                if provider != "replay":
+                    providerMap[provider] = wrap(kind, provider, func)
+
+    def recordCall(self, kind, provider, func):
+        def call(systemMsg, userMsg):
+            start = time.perf_counter()
+            response = func(systemMsg, userMsg)
+            self.record(kind, provider, systemMsg, userMsg, response, time.perf_counter() - start)
+            return response
+        return call
+
+    def arecordCall(self, kind, provider, func):
+        async def call(systemMsg, userMsg):
+            start = time.perf_counter()
+            response = await func(systemMsg, userMsg)
+            self.record(kind, provider, systemMsg, userMsg, response, time.perf_counter() - start)
+            return response
+        return call
+
+    def recordStream(self, kind, provider, func):
+        def call(systemMsg, userMsg):
+            start, chunks = time.perf_counter(), []
+            for chunk in func(systemMsg, userMsg):
+                chunks.append(chunk)
+                yield chunk
+            self.record(kind, provider, systemMsg, userMsg, "".join(chunks), time.perf_counter() - start)
+        return call
+
+    def arecordStream(self, kind, provider, func):
+        async def call(systemMsg, userMsg):
+            start, chunks = time.perf_counter(), []
+            async for chunk in func(systemMsg, userMsg):
+                chunks.append(chunk)
+                yield chunk
+            self.record(kind, provider, systemMsg, userMsg, "".join(chunks), time.perf_counter() - start)
+        return call
+
+    # ----- Replaying -----
+    def loadTracks(self):
+        tracks = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A line cut short while recording
+                    tracks.setdefault(entry["key"], []).append(entry)
+        except OSError:
+            raise LookupError(f"No LLM cassette to replay at {self.path}, record one with LLM_RECORD=True first")
+        return tracks
+
+    def nextEntry(self, kind, systemMsg, userMsg):
+        key = self.makeKey(kind, systemMsg, userMsg)
+        with self.cassetteLock:
+            if self.tracks is None:
+                self.tracks = self.loadTracks()
+            track = self.tracks.get(key)
+            if not track:
+                raise LookupError(f"The LLM cassette {self.path} has no recorded response for: {userMsg[:80]!r}")
+            played = self.played.get(key, 0)
+            self.played[key] = played + 1
+            return track[min(played, len(track) - 1)]
+
+    def delay(self, entry):
+        return entry.get("seconds", 0) if self.replayLatency else 0
+
+    def toolCalls(self, response):
+        if isinstance(response, str):
+            return response  # The model answered in text instead of calling a tool
+        return [(name, args) for name, args in response]
+
+    def replay(self, systemMsg, userMsg):
+        entry = self.nextEntry("text", systemMsg, userMsg)
+        time.sleep(self.delay(entry))
+        return entry["response"]
+
+    async def areplay(self, systemMsg, userMsg):
+        entry = self.nextEntry("text", systemMsg, userMsg)
+        await asyncio.sleep(self.delay(entry))
+        return entry["response"]
+
+    def replayStream(self, systemMsg, userMsg):
+        entry = self.nextEntry("stream", systemMsg, userMsg)
+        time.sleep(self.delay(entry))
+        yield entry["response"]
+
+    async def areplayStream(self, systemMsg, userMsg):
+        entry = self.nextEntry("stream", systemMsg, userMsg)
+        await asyncio.sleep(self.delay(entry))
+        yield entry["response"]
+
+    def replayTools(self, systemMsg, userMsg):
+        entry = self.nextEntry("tools", systemMsg, userMsg)
+        time.sleep(self.delay(entry))
+        return self.toolCalls(entry["response"])
+
+    async def areplayTools(self, systemMsg, userMsg):
+        entry = self.nextEntry("tools", systemMsg, userMsg)
+        await asyncio.sleep(self.delay(entry))
+        return self.toolCalls(entry["response"])
+
+    def rewind(self):
+        """Start every track from its first recording again."""
+        with self.cassetteLock:
+            self.played.clear()
@@ -0,0 +1,79 @@
+import os
+import asyncio
+import weakref
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class ProviderClients:
+    """
+    Lazily built LLM provider clients shared by every caller.
+    Provider SDKs are only imported, and clients only constructed, the first time
+    the active provider actually makes a request.
+    Async clients pool connections on the event loop that first used them, so they are built once per loop.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(ProviderClients, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.clientLock  = threading.Lock()
+        self.gptClient   = None
+        self.genClient   = None
+        self.loopClients = weakref.WeakKeyDictionary()  # event loop -> {provider: async client}
+
+    def getOpenai(self):
+        if self.gptClient is None:
+            with self.clientLock:
+                if self.gptClient is None:
+                    from openai import OpenAI
+                    self.gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self.gptClient
+
+    def getLoopClient(self, provider, build):
+        """Get the async client for provider that belongs to the running event loop, building it on first use."""
+        loop = asyncio.get_running_loop()
+        with self.clientLock:
+            loopClients = self.loopClients.setdefault(loop, {})
+            if provider not in loopClients:
+                loopClients[provider] = build()
+            return loopClients[provider]
+
+    def getAsyncOpenai(self):
+        def build():
+            from openai import AsyncOpenAI
+            return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self.getLoopClient("openai", build)
+
+    def getGoogle(self):
+        if self.genClient is None:
+            with self.clientLock:
+                if self.genClient is None:
+                    from google import genai
+                    self.genClient = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        return self.genClient
+
+    def getAsyncGoogle(self):
+        """Async calls go through the .aio namespace of the returned client."""
+        def build():
+            from google import genai
+            return genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        return self.getLoopClient("google", build)
+
+    def getGoogleTypes(self):
+        from google.genai import types
+        return types
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Memoizing cache for LLM responses keyed on (provider, model, system message, user message).
+    Keeps an in-memory LRU with size and TTL limits and an optional sqlite tier that survives restarts.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(ResponseCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.enabled   = os.getenv('LLM_CACHE', 'False') == 'True'
+        self.maxSize   = int(os.getenv('LLM_CACHE_SIZE', '256'))
+        self.ttl       = float(os.getenv('LLM_CACHE_TTL', '3600'))
+        self.diskPath  = os.getenv('LLM_CACHE_PATH', '')
+        self.entries   = OrderedDict()
+        self.cacheLock = threading.RLock()
+        self.hits      = 0
+        self.diskHits  = 0
+        self.misses    = 0
+        self.db        = None
+        if self.enabled and self.diskPath:
+            self._openDisk(self.diskPath)
+
+    def _openDisk(self, path):
+        try:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, created REAL)"
+            )
+            self.db.commit()
+        except sqlite3.Error:
+            logger.error(f"Could not open LLM cache at {path}, continuing in memory only:", exc_info=True)
+            self.db = None
+
+    def makeKey(self, provider, model, systemMsg, userMsg):
+        raw = json.dumps([provider, model, systemMsg, userMsg], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _expired(self, created):
+        return self.ttl > 0 and time.time() - created > self.ttl
+
+    def get(self, key):
+        """
+        Get a cached response, or None on a miss.
+        Disk hits are promoted into the in-memory tier.
+        """
+        if not self.enabled:
+            return None
+        with self.cacheLock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                response, created = entry
+                if not self._expired(created):
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self.entries[key]
+            if self.db is not None:
+                row = self.db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and not self._expired(row[1]):
+                    self._remember(key, row[0], row[1])
+                    self.diskHits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, response):
+        if not self.enabled or response is None:
+            return
+        created = time.time()
+        with self.cacheLock:
+            self._remember(key, response, created)
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                        (key, response, created)
+                    )
+                    self.db.commit()
+                except sqlite3.Error:
+                    logger.error("Could not write to the LLM cache:", exc_info=True)
+
+    def _remember(self, key, response, created):
+        self.entries[key] = (response, created)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.cacheLock:
+            self.entries.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM responses")
+                self.db.commit()
+
+    def getStats(self):
+        """Get hit/miss counters for the cache."""
+        with self.cacheLock:
+            lookups = self.hits + self.diskHits + self.misses
+            return {
+                "hits": self.hits,
+                "diskHits": self.diskHits,
+                "misses": self.misses,
+                "size": len(self.entries),
+                "hitRate": (self.hits + self.diskHits) / lookups if lookups else 0.0,
+            }
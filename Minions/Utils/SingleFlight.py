@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Runs each distinct key once and shares the outcome with every caller asking for it.
+    One instance lives for a single goal, so identical steps and tool calls in that goal
+    execute once, while the next goal starts fresh.
+    """
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.flights = {}  # key -> Future holding the shared outcome
+        self.shared  = 0   # calls answered by another caller's flight
+
+    def do(self, key, fn):
+        """
+        Call fn() for the first caller of key, every other caller waits for and gets the same result.
+        Exceptions are shared the same way.
+        """
+        with self.lock:
+            future = self.flights.get(key)
+            isOwner = future is None
+            if isOwner:
+                future = Future()
+                self.flights[key] = future
+            else:
+                self.shared += 1
+        if not isOwner:
+            return future.result()
+
+        try:
+            result = fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
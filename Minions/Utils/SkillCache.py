@@ -0,0 +1,111 @@
+import sys
+import time
+import inspect
+import threading
+from collections import OrderedDict
+
+
+class SkillCache:
+    """
+    Thread-safe result cache for skills that declare a cache policy.
+
+    Module skills declare it with a module-level CACHE_POLICY dict, class skills
+    with a "cachePolicy" entry in their _metaData(). Supported keys:
+        ttl              seconds a result stays valid (required, 0 or missing disables caching)
+        roundTo          round float arguments to this many decimals before building the key
+        maxEntries       per-action LRU size (default 128)
+        uncachedPrefixes results starting with any of these strings are never cached
+    Skills without a policy, or with CACHE_POLICY = None, are always executed.
+    """
+    DEFAULT_MAX_ENTRIES = 128
+    ERROR_PREFIXES = ("Error",)
+
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.entries  = {}  # actionName -> OrderedDict(key -> (storedAt, result))
+        self.policies = {}  # function -> policy
+        self.stats    = {}  # actionName -> {"hits": int, "misses": int}
+
+    def getPolicy(self, func):
+        """Get the cache policy declared by the skill that owns func, or None."""
+        target = getattr(func, "__func__", func)
+        if target in self.policies:
+            return self.policies[target]
+        owner = getattr(func, "__self__", None)
+        if owner is not None and not inspect.ismodule(owner):
+            metaMethod = getattr(owner, "_metaData", None) or getattr(owner, "_metadata", None)
+            policy = metaMethod().get("cachePolicy") if callable(metaMethod) else None
+        else:
+            policy = getattr(sys.modules.get(getattr(func, "__module__", None)), "CACHE_POLICY", None)
+        if not isinstance(policy, dict) or not policy.get("ttl"):
+            policy = None
+        self.policies[target] = policy
+        return policy
+
+    def makeKey(self, policy, args, kwargs):
+        roundTo = policy.get("roundTo")
+
+        def normalize(value):
+            if roundTo is not None and isinstance(value, float):
+                return round(value, roundTo)
+            if isinstance(value, str):
+                return value.strip().lower()
+            return value
+
+        return (
+            tuple(normalize(a) for a in args),
+            tuple(sorted((k, normalize(v)) for k, v in kwargs.items())),
+        )
+
+    def get(self, name, policy, key):
+        """Get (True, result) on a hit or (False, None) on a miss."""
+        with self.lock:
+            stats = self.stats.setdefault(name, {"hits": 0, "misses": 0})
+            entries = self.entries.get(name)
+            entry = entries.get(key) if entries else None
+            if entry is not None:
+                storedAt, result = entry
+                if time.monotonic() - storedAt < policy["ttl"]:
+                    entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return True, result
+                del entries[key]
+            stats["misses"] += 1
+            return False, None
+
+    def put(self, name, policy, key, result, failed=False):
+        """Store a result, unless the run that produced it failed or the result looks like an error."""
+        if failed or not self.isCacheable(policy, result):
+            return
+        with self.lock:
+            entries = self.entries.setdefault(name, OrderedDict())
+            entries[key] = (time.monotonic(), result)
+            entries.move_to_end(key)
+            while len(entries) > policy.get("maxEntries", self.DEFAULT_MAX_ENTRIES):
+                entries.popitem(last=False)
+
+    def isCacheable(self, policy, result):
+        if result is None or result == "":
+            return False
+        if isinstance(result, str):
+            prefixes = self.ERROR_PREFIXES + tuple(policy.get("uncachedPrefixes", ()))
+            return not result.startswith(prefixes)
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.policies.clear()
+
+    def getStats(self):
+        """Get hit/miss counters per action and overall."""
+        with self.lock:
+            hits = sum(s["hits"] for s in self.stats.values())
+            misses = sum(s["misses"] for s in self.stats.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hitRate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": sum(len(e) for e in self.entries.values()),
+                "actions": {name: dict(s) for name, s in self.stats.items()},
+            }
@@ -5,16 +5,41 @@ import inspect
 import os
 import threading
 import logging
+import functools
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 
 from SkillLink import SkillLink # Dont for get to pip install SkillLink
 
+from Utils.SkillCache import SkillCache
+from Utils.SkillManifest import SkillManifest, LazyAction, importSkillFile
+from Utils.SkillWatcher import SkillWatcher
+from Utils.SkillPool import SkillPool
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
+class SkillCatalog:
+    """
+    Immutable snapshot of everything the hot path needs to know about the loaded skills.
+    SkillGraph swaps in a whole new catalog on reload, so readers never see a half-built one.
+    """
+    __slots__ = ("version", "names", "actions", "actionList", "capabilities", "instructions", "toolSchemas")
+
+    def __init__(self, version, actions, capabilities, instructions):
+        self.version      = version
+        self.names        = frozenset(actions)
+        self.actions      = MappingProxyType(dict(actions))
+        self.actionList   = ", ".join(actions)
+        self.capabilities = capabilities
+        self.instructions = instructions
+        self.toolSchemas  = {}  # schemaType -> tool schemas, filled on first use
+
+
 class SkillGraph:
     _instance = None
     _lock = threading.Lock()
@@ -34,9 +59,44 @@ class SkillGraph:
 
     def _initComponents(self):
         self.skillLink         = SkillLink()
+        self.skillCache        = SkillCache()
+        self.skillPool         = SkillPool(self.getDir('Skills'))
         self.printCapabilities = os.getenv('SHOW_CAPABILITIES', 'False') == 'True'
         self.printMetaData     = os.getenv('SHOW_METADATA', 'False') == 'True'
-        self.loadAllComponents()
+        self.manifestMode      = os.getenv('SKILL_MANIFEST', 'False') == 'True'
+        self.watchSkills       = os.getenv('SKILL_WATCH', 'False') == 'True'
+        self.watchInterval     = float(os.getenv('SKILL_WATCH_INTERVAL', '1.0'))
+        self.skillWatcher      = None
+        self.loadLock          = threading.RLock()
+        self._minionSkills     = None
+        self._catalog          = None
+        self._skillManifest    = None
+
+    @property
+    def skillManifest(self) -> SkillManifest:
+        """
+        Manifest describing the skills without importing them, used when SKILL_MANIFEST is on.
+        """
+        if self._skillManifest is None:
+            with self.loadLock:
+                if self._skillManifest is None:
+                    self._skillManifest = SkillManifest(
+                        self.skillLink,
+                        self.getDir('Skills'),
+                        os.getenv('SKILL_MANIFEST_PATH') or self.getDir('.skillManifest.json'),
+                    )
+        return self._skillManifest
+
+    @property
+    def minionSkills(self):
+        """
+        Skills are loaded on first use rather than at construction, so importing a caller stays cheap.
+        """
+        if self._minionSkills is None:
+            with self.loadLock:
+                if self._minionSkills is None:
+                    self.loadAllComponents()
+        return self._minionSkills
 
     def getDir(self, *paths):
         return self.skillLink.getDir(*paths)
@@ -46,23 +106,31 @@ class SkillGraph:
         Load all components from the specified directories.
         This method loads skills and tools from the 'Skills' directory.
         """
-        self.minionSkills = []
+        minionSkills = []
 
         self.skillLink.loadComponents(
             paths=[
                 ['Skills'],
             ],
             components=[
-                self.minionSkills,
+                minionSkills,
             ],
             reloadable=[
                 False
             ]
         )
+        self._minionSkills = minionSkills
 
     def getMinionActions(self):
         """
         Get self actions based on the skills available.
+        Served from the precomputed catalog, treat the mapping as read-only.
+        """
+        return self.getCatalog().actions
+
+    def buildMinionActions(self):
+        """
+        Build self actions through SkillLink.
         This method combines dynamic, static, and restricted self skills.
         """
         skills = (
@@ -70,17 +138,161 @@ class SkillGraph:
         )
         return self.skillLink.getComponents(skills)
 
+    def getCatalog(self) -> SkillCatalog:
+        """
+        Get the current skill catalog, building it on first use.
+        """
+        catalog = self._catalog
+        if catalog is None:
+            with self.loadLock:
+                if self._catalog is None:
+                    self._catalog = self.buildCatalog(1)
+                    if self.watchSkills:
+                        self.startWatching()
+                catalog = self._catalog
+        return catalog
+
+    def buildCatalog(self, version) -> SkillCatalog:
+        if self.manifestMode:
+            return self.buildManifestCatalog(version)
+        capabilities = self.buildMinionCapabilities()
+        return SkillCatalog(
+            version,
+            self.buildMinionActions(),
+            capabilities,
+            self.skillLink.skillInstructions(capabilities),
+        )
+
+    def buildManifestCatalog(self, version) -> SkillCatalog:
+        """
+        Build the catalog from the skill manifest, skill modules are imported when an action first runs.
+        """
+        self.skillManifest.refresh()
+        capabilities = self.skillManifest.getCapabilities()
+        if self.printCapabilities:
+            print(capabilities)
+        return SkillCatalog(
+            version,
+            self.skillManifest.getActions(),
+            capabilities,
+            self.skillLink.skillInstructions(capabilities, examples=self.skillLink.generateExamples(capabilities)),
+        )
+
+    def getActionList(self) -> str:
+        """Get the comma-separated action names used in planning prompts."""
+        return self.getCatalog().actionList
+
+    def hasAction(self, name: str) -> bool:
+        return name in self.getCatalog().names
+
+    def getCatalogVersion(self) -> int:
+        """Get the catalog version, bumped by every reloadSkills."""
+        return self.getCatalog().version
+
     def reloadSkills(self):
         """
         Reload all skills and print any new skills added.
         """
+        if self.manifestMode:
+            return self.reloadManifestSkills()
         original = self.getMetaData()
+        version = self.getCatalogVersion()
         self.skillLink.reloadSkills()
-        new = self.getMetaData()
-        for skill in new:
-            if skill not in original:
+        catalog = self.buildCatalog(version + 1)
+        with self.loadLock:
+            self._catalog = catalog
+        self.skillCache.clear()
+        self.skillPool.restart()
+        known = {(skill['className'], skill['description']) for skill in original}
+        for skill in self.getMetaData():
+            if (skill['className'], skill['description']) not in known:
                 print(f"I've added the new skill {skill['className']} That {skill['description']}.\n")
 
+    def reloadManifestSkills(self):
+        """
+        Re-scan the skills directory, only files whose contents changed are described again.
+        """
+        with self.loadLock:
+            original = self.getCatalog()
+            changedFiles = self.skillManifest.refresh()
+            catalog = self.buildCatalog(original.version + 1)
+            self._catalog = catalog
+        self.skillCache.clear()
+        self.skillPool.restart()
+        return self.reportSkillChanges(original, catalog, changedFiles)
+
+    def reloadChangedSkills(self, fileNames):
+        """
+        Re-import only the given skill files and swap in a catalog that reflects them.
+        Executions already running keep the callables they started with and are never blocked.
+        """
+        fileNames = set(fileNames)
+        with self.loadLock:
+            original = self.getCatalog()
+            if self.manifestMode:
+                fileNames |= set(self.skillManifest.refresh())
+            else:
+                self.patchSkillFiles(fileNames)
+            catalog = self.buildCatalog(original.version + 1)
+            self._catalog = catalog
+        self.skillCache.clear()
+        self.skillPool.restart()
+        return self.reportSkillChanges(original, catalog, fileNames)
+
+    def patchSkillFiles(self, fileNames):
+        """
+        Replace the loaded components of the given skill files, leaving every other skill untouched.
+        """
+        modules = {f"_dynamic_{Path(name).stem}" for name in fileNames}
+        skills = [skill for skill in self.minionSkills if self.skillModule(skill) not in modules]
+        skillDir = Path(self.getDir('Skills'))
+        for name in sorted(fileNames):
+            if (skillDir / name).is_file():
+                skills.extend(importSkillFile(skillDir / name))
+        self._minionSkills = skills
+
+    def skillModule(self, skill):
+        """Get the name of the module a loaded skill component or action comes from."""
+        if isinstance(skill, LazyAction):
+            return f"_dynamic_{Path(skill.fileName).stem}"
+        if inspect.ismodule(skill):
+            return skill.__name__
+        return getattr(skill, "__module__", None) or type(skill).__module__
+
+    def reportSkillChanges(self, original, catalog, fileNames):
+        """
+        Diff two catalogs by action name. Actions present in both count as changed when their file changed.
+        """
+        modules = {f"_dynamic_{Path(name).stem}" for name in fileNames}
+        changes = {
+            "added": sorted(catalog.names - original.names),
+            "removed": sorted(original.names - catalog.names),
+            "changed": sorted(
+                name for name in catalog.names & original.names
+                if self.skillModule(catalog.actions[name]) in modules
+            ),
+        }
+        for name in changes["added"]:
+            print(f"I've added the new skill {name}.\n")
+        for name in changes["removed"]:
+            print(f"I've removed the skill {name}.\n")
+        for name in changes["changed"]:
+            print(f"I've updated the skill {name}.\n")
+        return changes
+
+    def startWatching(self):
+        """
+        Watch the Skills directory and hot reload changed skill files in the background.
+        """
+        if self.skillWatcher is None:
+            self.skillWatcher = SkillWatcher(self.getDir('Skills'), self.reloadChangedSkills, interval=self.watchInterval)
+            self.skillWatcher.start()
+
+    def stopWatching(self):
+        if self.skillWatcher is not None:
+            self.skillWatcher.stop()
+            self.skillWatcher = None
+
     def getMetaData(self):
         """Get metadata for all skills."""
         metaData = (
@@ -91,7 +303,13 @@ class SkillGraph:
     # ----- Skills -----
     def getMinionCapabilities(self):
         """
-        Get the capabilities of the agent based on its skills.
+        Get the capabilities of the agent based on its skills, served from the precomputed catalog.
+        """
+        return self.getCatalog().capabilities
+
+    def buildMinionCapabilities(self):
+        """
+        Build the capabilities of the agent based on its skills.
         This method retrieves the capabilities of the agent's skills and returns them in a structured format.
         """
         description = False
@@ -115,6 +333,35 @@ class SkillGraph:
         """
         return self.skillLink.actionParser.getActions(action)
 
+    def getDirectActions(self, step: str) -> list:
+        """
+        Parse a decomposed step straight into executable actions, without asking the LLM to clarify it.
+        Every call must name a known action and fit that action's signature.
+        Returns an empty list if any call fails to validate, so callers can fall back to clarifying.
+        """
+        allSkills = self.getMinionActions()
+        actions = self.getActions(step.strip().strip("`"))
+        if not actions or not all(self.validateAction(allSkills, action) for action in actions):
+            return []
+        return actions
+
+    def validateAction(self, allSkills, action: str) -> bool:
+        """
+        Check that an action string is a call to a known skill with arguments that bind to its signature.
+        """
+        match = re.fullmatch(r"\s*([A-Za-z_]\w*)\s*\((.*)\)\s*", action, re.DOTALL)
+        if not match:
+            return False
+        func = allSkills.get(match.group(1))
+        if func is None:
+            return False
+        try:
+            args, kwargs = self.skillLink.actionParser.parseActions(match.group(2).strip())
+            inspect.signature(func).bind(*args, **kwargs)
+        except (TypeError, ValueError):
+            return False
+        return True
+
     def executeAction(self, actions, action):
         """
         Execute a single action based on the provided actions and action string.
@@ -122,18 +369,199 @@ class SkillGraph:
         """
         return self.skillLink.actionParser.executeAction(actions, action)
 
-    def executeActions(self, actions, action):
+    def executeActions(self, actions, action, flight=None):
         """
         Execute both single and multiple actions based on the provided actions and action string.
         The for loop is handled internally, so you can pass a single action or a list of actions.
+        Skills that declare a cache policy are served from the shared skill cache when possible.
+        Pass a SingleFlight to run identical calls only once and share their result.
+        """
+        if not hasattr(actions, 'get'):
+            return self.skillLink.actionParser.executeActions(actions, action)
+        if isinstance(action, str):
+            action = [a.strip() for a in action.strip().splitlines() if a.strip()]
+        if flight is None:
+            return [self.executeCachedAction(actions, a) for a in action]
+        return [
+            flight.do(("action", self.canonicalAction(a)), lambda a=a: self.executeCachedAction(actions, a))
+            for a in action
+        ]
+
+    def canonicalAction(self, action: str) -> str:
+        """
+        Get a canonical form of an action or step, so calls that differ only in
+        spacing, quoting or letter case of the action name compare equal.
+        Text that isn't a parseable call is normalized for whitespace and case only.
+        """
+        text = action.strip().strip("`").strip()
+        match = re.fullmatch(r"([A-Za-z_]\w*)\s*\((.*)\)", text, re.DOTALL)
+        if match:
+            try:
+                args, kwargs = self.skillLink.actionParser.parseActions(match.group(2).strip())
+                return f"{match.group(1).lower()}({args!r}, {sorted(kwargs.items())!r})"
+            except Exception:
+                pass
+        return " ".join(text.lower().split())
+
+    def executeCachedAction(self, actions, action: str):
+        """
+        Execute a single action, honoring the cache policy declared by its skill.
+        CPU-bound skills run in the skill process pool.
+        """
+        name, args, kwargs = self.parseAction(action)
+
+        def execute():
+            # SkillLink turns a raising skill into a plain message, the guard still tells the cache it failed
+            failures = []
+            routed = self.skillPool.route(actions, name)
+            if callable(routed.get(name)):
+                routed = {name: self.guardFailures(routed[name], failures)}
+            result = self.skillLink.actionParser.executeActions(routed, [action])[0]
+            return result, bool(failures)
+
+        return self.cachedCall(name, actions.get(name), args, kwargs, execute)
+
+    def guardFailures(self, func, failures):
+        """Wrap func so every exception it raises is appended to failures before propagating."""
+        @functools.wraps(func)
+        def guarded(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                failures.append(e)
+                raise
+        return guarded
+
+    def cachedCall(self, name, func, args, kwargs, execute):
+        """
+        Run execute() unless the skill behind func declares a cache policy and already has a fresh result.
+        execute() returns (result, failed), results of a failed run are never cached.
+        """
+        if isinstance(func, LazyAction):
+            try:
+                func = func.resolve()
+            except Exception:
+                func = None
+        policy = self.skillCache.getPolicy(func) if func else None
+        if policy is None:
+            return execute()[0]
+        try:
+            key = self.skillCache.makeKey(policy, args, kwargs)
+            hash(key)
+        except TypeError:
+            return execute()[0]
+        hit, result = self.skillCache.get(name, policy, key)
+        if hit:
+            return result
+        result, failed = execute()
+        self.skillCache.put(name, policy, key, result, failed)
+        return result
+
+    def parseAction(self, action: str):
+        """
+        Split an action string into its name, positional and keyword arguments.
         """
-        return self.skillLink.actionParser.executeActions(actions, action)
+        if "(" in action and ")" in action:
+            name, params = action.split("(", 1)
+            args, kwargs = self.skillLink.actionParser.parseActions(params.rstrip(")").strip())
+            return name.strip(), args, kwargs
+        return action.strip(), [], {}
+
+    # ----- Tools -----
+    def getTools(self) -> dict:
+        """
+        Get {name: callable} for every skill action, for native function calling.
+        Manifest-mode actions are resolved, since schemas need the real signature and docstring.
+        """
+        return {
+            name: func.resolve() if isinstance(func, LazyAction) else func
+            for name, func in self.getMinionActions().items()
+        }
+
+    def getJsonSchema(self, func, schemaType="chat_completions"):
+        """Build an OpenAI tool schema for a function from its signature and docstring."""
+        return self.skillLink.getJsonSchema(func, schemaType)
+
+    def getTypedSchema(self, func):
+        """Build a Google GenAI function declaration for a function from its signature and docstring."""
+        return self.skillLink.getTypedSchema(func)
+
+    def getToolSchemas(self, schemaType="chat_completions"):
+        """
+        Get the tool schemas for every skill action, built once per catalog.
+        schemaType is 'chat_completions' or 'responses' for OpenAI, or 'typed' for Google GenAI function declarations.
+        Schemas are dropped together with the catalog whenever skills reload.
+        """
+        catalog = self.getCatalog()
+        schemas = catalog.toolSchemas.get(schemaType)
+        if schemas is None:
+            tools = self.getTools()
+            if schemaType == "typed":
+                schemas = [self.getTypedSchema(func) for func in tools.values()]
+            else:
+                schemas = [self.getJsonSchema(func, schemaType) for func in tools.values()]
+            catalog.toolSchemas[schemaType] = schemas
+        return schemas
+
+    def executeTool(self, name, tools, args, threshold=80, retry=False):
+        """
+        Call a tool by its name, auto-fixing missing argument names using fuzzy matching if needed.
+        """
+        return self.skillLink.executeTool(name, tools, args, threshold, retry)
+
+    def executeToolCall(self, tools, name, args):
+        """
+        Execute one model tool call, honoring the skill's cache policy. Failures come back as 'Error: ...' strings.
+        CPU-bound skills run in the skill process pool.
+        """
+        def execute():
+            try:
+                result = self.executeTool(name, self.skillPool.route(tools, name), args)
+            except Exception as e:
+                logger.error(f"Tool call {name}({args}) failed:", exc_info=True)
+                return f"Error: {e}", True
+            if isinstance(result, dict) and "error" in result:
+                return f"Error: {result['error']}", True
+            return result, False
+
+        if name not in tools:
+            return f"Error: Unknown tool {name}"
+        return self.cachedCall(name, tools[name], (), args, execute)
+
+    def executeToolCalls(self, calls, flight=None, maxWorkers=4):
+        """
+        Execute every (name, args) tool call from one model turn in parallel.
+        Results keep the call order, pass a SingleFlight to share identical calls.
+        """
+        if not calls:
+            return []
+        tools = self.getTools()
+
+        def run(call):
+            name, args = call
+            if flight is None:
+                return self.executeToolCall(tools, name, args)
+            key = ("tool", name, json.dumps(args, sort_keys=True, default=str))
+            return flight.do(key, lambda: self.executeToolCall(tools, name, args))
+
+        if len(calls) == 1:
+            return [run(calls[0])]
+        with ThreadPoolExecutor(max_workers=max(1, min(maxWorkers, len(calls))), thread_name_prefix="ToolCall") as executor:
+            return list(executor.map(run, calls))
+
+    def extractJson(self, text):
+        """Extract the first JSON array or object from a string, even if wrapped in markdown or extra commentary."""
+        return self.skillLink.extractJson(text)
+
+    def getCacheStats(self):
+        """Get hit-rate stats for skill results served from the skill cache."""
+        return self.skillCache.getStats()
 
     def skillInstructions(self):
         """
-        Get skill instructions for the agent based on its capabilities.
+        Get skill instructions for the agent based on its capabilities, served from the precomputed catalog.
         """
-        return self.skillLink.skillInstructions(self.getMinionCapabilities())
+        return self.getCatalog().instructions
 
     def isStructured(self, *args):
         """
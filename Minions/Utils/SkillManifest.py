@@ -0,0 +1,266 @@
+import os
+import ast
+import sys
+import json
+import hashlib
+import inspect
+import logging
+import threading
+import importlib.util
+from pathlib import Path
+
+from SkillLink import SkillParser
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Module attributes SkillLink reads at runtime, a module declaring any of them can't be described from source alone
+RUNTIME_ATTRS = {"actionMap", "ACTION_MAP", "action_map", "listSig", "list_info", "LIST_SIG", "dictSig", "dict_sig", "DICT_SIG"}
+
+
+def importSkillFile(py):
+    """
+    Import a skill file the way SkillLink's loader does and return its components:
+    an instance of every class defined in it, plus the module itself if it has public functions.
+    """
+    modName = f"_dynamic_{py.stem}"
+    try:
+        spec = importlib.util.spec_from_file_location(modName, str(py))
+        mod  = importlib.util.module_from_spec(spec)
+        sys.modules[modName] = mod
+        spec.loader.exec_module(mod)
+    except Exception:
+        logger.warning(f"Could not load module from {py}:", exc_info=True)
+        return []
+
+    components = []
+    for _, cls in inspect.getmembers(mod, inspect.isclass):
+        if cls.__module__ != modName:
+            continue
+        try:
+            components.append(cls())
+        except Exception:
+            logger.error(f"Failed to instantiate {cls.__name__} in {py.name}", exc_info=True)
+    publicFuncs = [
+        fn for name, fn in inspect.getmembers(mod, inspect.isfunction)
+        if fn.__module__ == modName and not name.startswith("_")
+    ]
+    if publicFuncs:
+        components.append(mod)
+    return components
+
+
+class LazyAction:
+    """
+    Stand-in for a skill action whose module hasn't been imported yet.
+    The module is imported the first time the action is called or its signature is inspected.
+    """
+    def __init__(self, manifest, fileName, name):
+        self.manifest = manifest
+        self.fileName = fileName
+        self.name     = name
+
+    def resolve(self):
+        return self.manifest.resolveAction(self.fileName, self.name)
+
+    @property
+    def __signature__(self):
+        return inspect.signature(self.resolve())
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<LazyAction {self.name} from {self.fileName}>"
+
+
+class SkillManifest:
+    """
+    Describes the skills in a directory without importing them.
+
+    Plain function skills are read statically with ast. Files that need their runtime state to be
+    described (classes, action maps, decorated functions) are imported once and rendered through SkillLink.
+    Entries are persisted to disk and reused for as long as the file's mtime/size, or failing that its hash,
+    is unchanged, so a warm start imports no skill module until one of its actions runs.
+    """
+    def __init__(self, skillLink, skillDir, manifestPath):
+        self.skillLink    = skillLink
+        self.skillDir     = Path(skillDir)
+        self.manifestPath = Path(manifestPath)
+        self.lock         = threading.RLock()
+        self.entries      = self.loadManifest()
+        self.modules      = {}  # fileName -> {actionName: callable} for imported skill files
+
+    def loadManifest(self):
+        try:
+            data = json.loads(self.manifestPath.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def saveManifest(self):
+        tmpPath = self.manifestPath.with_name(self.manifestPath.name + ".tmp")
+        try:
+            tmpPath.write_text(json.dumps({"version": MANIFEST_VERSION, "files": self.entries}, indent=2), encoding="utf-8")
+            os.replace(tmpPath, self.manifestPath)
+        except OSError:
+            logger.warning(f"Could not write the skill manifest to {self.manifestPath}:", exc_info=True)
+
+    def skillFiles(self):
+        if not self.skillDir.is_dir():
+            logger.error(f"Skills directory not found: {self.skillDir}")
+            return []
+        return sorted(
+            py for py in self.skillDir.iterdir()
+            if py.is_file() and py.suffix == ".py" and py.name != "__init__.py"
+        )
+
+    def refresh(self):
+        """
+        Bring the manifest in line with the skills directory.
+        Returns the names of files that were added, changed or removed.
+        """
+        with self.lock:
+            changed = []
+            seen = set()
+            for py in self.skillFiles():
+                seen.add(py.name)
+                stat = py.stat()
+                entry = self.entries.get(py.name)
+                if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+                source = py.read_bytes()
+                digest = hashlib.sha1(source).hexdigest()
+                if entry and entry["sha1"] == digest:
+                    entry["mtime"], entry["size"] = stat.st_mtime_ns, stat.st_size
+                    continue
+                self.modules.pop(py.name, None)
+                self.entries[py.name] = self.describeFile(py, source, digest, stat)
+                changed.append(py.name)
+            for name in set(self.entries) - seen:
+                del self.entries[name]
+                self.modules.pop(name, None)
+                changed.append(name)
+            if changed or not self.manifestPath.exists():
+                self.saveManifest()
+            return changed
+
+    def describeFile(self, py, source, digest, stat):
+        entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest}
+        try:
+            described = self.describeSource(source)
+        except SyntaxError:
+            logger.warning(f"Could not parse skill file {py}:", exc_info=True)
+            described = {"actions": [], "capabilities": [], "descriptions": {}}
+        if described is None:
+            described = self.describeImported(py)
+            described["static"] = False
+        else:
+            described["static"] = True
+        entry.update(described)
+        return entry
+
+    def describeSource(self, source):
+        """
+        Describe the public functions of a skill module from its source.
+        Returns None when the module needs to be imported to be described.
+        """
+        tree = ast.parse(source)
+        actions, capabilities, descriptions = [], [], {}
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                return None
+            if isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                if any(isinstance(t, ast.Name) and t.id in RUNTIME_ATTRS for t in targets):
+                    return None
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or node.name.startswith("_"):
+                continue
+            if node.decorator_list:
+                return None
+            signature, usage = self.describeArguments(node.args)
+            actions.append(node.name)
+            capabilities.append(SkillParser.formatCapabilityDoc(
+                f"{node.name}({signature}):", "", usage, False, False, bool(usage)
+            ))
+            parsed = SkillParser.parseSkillDocstring(ast.get_docstring(node) or "")
+            descriptions[node.name] = parsed["description"]
+        return {"actions": actions, "capabilities": capabilities, "descriptions": descriptions}
+
+    def describeArguments(self, args):
+        """
+        Build the signature text and Required/Optional usage the same way SkillLink renders module functions.
+        """
+        def annotated(name, annotation):
+            return f"{name}: {ast.unparse(annotation)}" if annotation is not None else name
+
+        def usageText(name, annotation):
+            return f"{name} ({ast.unparse(annotation)})" if annotation is not None else name
+
+        positional = args.posonlyargs + args.args
+        defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+        parts, required, optional = [], [], []
+        for arg, default in zip(positional, defaults):
+            if arg.arg == "self":
+                continue
+            parts.append(annotated(arg.arg, arg.annotation))
+            (required if default is None else optional).append(usageText(arg.arg, arg.annotation))
+        if args.vararg:
+            parts.append(annotated(f"*{args.vararg.arg}", args.vararg.annotation))
+            required.append(usageText(args.vararg.arg, args.vararg.annotation))
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            parts.append(annotated(arg.arg, arg.annotation))
+            (required if default is None else optional).append(usageText(arg.arg, arg.annotation))
+        if args.kwarg:
+            parts.append(annotated(f"**{args.kwarg.arg}", args.kwarg.annotation))
+            required.append(usageText(args.kwarg.arg, args.kwarg.annotation))
+        usage = {"required": required, "optional": optional} if required or optional else {}
+        return ", ".join(parts), usage
+
+    def describeImported(self, py):
+        """Import a skill file and let SkillLink render it, keeping its actions for later calls."""
+        components = importSkillFile(py)
+        actions = self.skillLink.getSelfActions(components) if components else {}
+        self.modules[py.name] = actions
+        descriptions = {}
+        for name, fn in actions.items():
+            parsed = SkillParser.parseSkillDocstring(inspect.getdoc(fn) or "")
+            descriptions[name] = parsed["description"]
+        return {
+            "actions": list(actions),
+            "capabilities": self.skillLink.parseCapabilities(components, False) if components else [],
+            "descriptions": descriptions,
+        }
+
+    def resolveAction(self, fileName, name):
+        """Get the real callable for an action, importing its skill file on first use."""
+        with self.lock:
+            actions = self.modules.get(fileName)
+            if actions is None:
+                components = importSkillFile(self.skillDir / fileName)
+                actions = self.skillLink.getSelfActions(components) if components else {}
+                self.modules[fileName] = actions
+        try:
+            return actions[name]
+        except KeyError:
+            raise LookupError(f"Skill file {fileName} no longer provides the action {name}")
+
+    def getActions(self):
+        """Get {actionName: LazyAction} for every action in the manifest."""
+        with self.lock:
+            return {
+                name: LazyAction(self, fileName, name)
+                for fileName, entry in self.entries.items()
+                for name in entry["actions"]
+            }
+
+    def getCapabilities(self):
+        with self.lock:
+            return "\n\n".join(cap for entry in self.entries.values() for cap in entry["capabilities"])
+
+    def getDescriptions(self):
+        with self.lock:
+            return {name: desc for entry in self.entries.values() for name, desc in entry["descriptions"].items()}
@@ -0,0 +1,182 @@
+import os
+import sys
+import pickle
+import inspect
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+MODULE_PREFIX = "_dynamic_"
+
+# Skill actions imported in this worker process, fileName -> {actionName: callable}
+workerActions = {}
+workerSkillDir = None
+
+
+def initWorker(skillDir):
+    """Runs once in every pool process, importing the skills up front so calls don't pay for it."""
+    global workerSkillDir
+    workerSkillDir = Path(skillDir)
+    for py in sorted(workerSkillDir.glob("*.py")):
+        if py.name != "__init__.py":
+            loadWorkerActions(py.name)
+
+
+def loadWorkerActions(fileName):
+    from SkillLink import SkillLink
+    from Utils.SkillManifest import importSkillFile
+    components = importSkillFile(workerSkillDir / fileName)
+    workerActions[fileName] = SkillLink().getSelfActions(components) if components else {}
+    return workerActions[fileName]
+
+
+def runInWorker(fileName, name, args, kwargs):
+    actions = workerActions.get(fileName)
+    if actions is None or name not in actions:
+        # A skill file added after the pool started
+        actions = loadWorkerActions(fileName)
+    if name not in actions:
+        raise LookupError(f"Skill file {fileName} does not provide the action {name}")
+    return actions[name](*args, **kwargs)
+
+
+class ProcessAction:
+    """
+    Stand-in for a CPU-bound skill action that runs it in the skill pool.
+    Keeps the real signature and docstring, so action parsing and tool argument matching work unchanged.
+    """
+    def __init__(self, pool, func, fileName, name, timeout):
+        self.pool     = pool
+        self.func     = func
+        self.fileName = fileName
+        self.name     = name
+        self.timeout  = timeout
+        self.__doc__  = func.__doc__
+        self.__name__ = name
+
+    @property
+    def __signature__(self):
+        return inspect.signature(self.func)
+
+    def __call__(self, *args, **kwargs):
+        return self.pool.call(self, args, kwargs)
+
+    def __repr__(self):
+        return f"<ProcessAction {self.name} from {self.fileName}>"
+
+
+class SkillPool:
+    """
+    Runs skills that declare themselves CPU-bound in a persistent process pool, so they don't hold the GIL
+    while other minions work. Every other skill keeps running on the calling thread.
+
+    Module skills declare it with a module-level CPU_BOUND (True, or a list of action names) and an optional
+    CPU_TIMEOUT in seconds, class skills with "cpuBound" and "cpuTimeout" entries in their _metaData().
+    Workers import the skills once when they start. Arguments and results cross the process boundary by pickling,
+    a call whose arguments can't be pickled runs inline instead. A call that runs past its timeout raises TimeoutError
+    and recycles the pool, since a running worker can't be interrupted any other way.
+    """
+    def __init__(self, skillDir):
+        self.skillDir   = Path(skillDir).resolve()
+        self.maxWorkers = int(os.getenv("SKILL_PROCESSES", "0")) or os.cpu_count() or 1
+        self.timeout    = float(os.getenv("SKILL_PROCESS_TIMEOUT", "60"))
+        self.lock       = threading.Lock()
+        self.executor   = None
+        self.policies   = {}  # function -> (cpuBound, timeout)
+
+    def getExecutor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.maxWorkers, initializer=initWorker, initargs=(str(self.skillDir),)
+                )
+            return self.executor
+
+    def restart(self, terminate=False):
+        """
+        Drop the pool and the cached declarations, workers re-import the skills on the next call.
+        With terminate=True running workers are killed too, calls still in flight on them fail.
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.policies.clear()
+        if executor is None:
+            return
+        workers = list((getattr(executor, "_processes", None) or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+
+    def getPolicy(self, func):
+        """Get (cpuBound, timeout) as declared by the skill that owns func."""
+        target = getattr(func, "__func__", func)
+        if target in self.policies:
+            return self.policies[target]
+        owner = getattr(func, "__self__", None)
+        if owner is not None and not inspect.ismodule(owner):
+            metaMethod = getattr(owner, "_metaData", None) or getattr(owner, "_metadata", None)
+            metaData = metaMethod() if callable(metaMethod) else {}
+            declared, timeout = metaData.get("cpuBound"), metaData.get("cpuTimeout")
+        else:
+            module = sys.modules.get(getattr(func, "__module__", None))
+            declared, timeout = getattr(module, "CPU_BOUND", None), getattr(module, "CPU_TIMEOUT", None)
+        if isinstance(declared, (list, tuple, set, frozenset)):
+            cpuBound = getattr(target, "__name__", None) in declared
+        else:
+            cpuBound = declared is True
+        policy = (cpuBound, float(timeout) if timeout else self.timeout)
+        self.policies[target] = policy
+        return policy
+
+    def skillFile(self, func):
+        """Get the skill file func was loaded from, or None if it didn't come from the skills directory."""
+        owner = getattr(func, "__self__", None)
+        module = type(owner).__module__ if owner is not None and not inspect.ismodule(owner) else getattr(func, "__module__", "")
+        if not module or not module.startswith(MODULE_PREFIX):
+            return None
+        fileName = f"{module[len(MODULE_PREFIX):]}.py"
+        return fileName if (self.skillDir / fileName).is_file() else None
+
+    def route(self, actions, name):
+        """
+        Get the actions to execute name with, swapping in a ProcessAction when its skill is CPU-bound.
+        """
+        func = actions.get(name)
+        resolve = getattr(func, "resolve", None)  # manifest mode LazyAction
+        if callable(resolve):
+            try:
+                func = resolve()
+            except Exception:
+                return actions
+        if not callable(func):
+            return actions
+        cpuBound, timeout = self.getPolicy(func)
+        fileName = self.skillFile(func) if cpuBound else None
+        if fileName is None:
+            return actions
+        return {name: ProcessAction(self, func, fileName, name, timeout)}
+
+    def call(self, action, args, kwargs):
+        try:
+            pickle.dumps((args, kwargs))
+        except Exception:
+            logger.warning(f"Arguments for {action.name} can't be pickled, running it inline")
+            return action.func(*args, **kwargs)
+        future = self.getExecutor().submit(runInWorker, action.fileName, action.name, tuple(args), dict(kwargs))
+        try:
+            return future.result(timeout=action.timeout)
+        except FutureTimeout:
+            # A running call can't be cancelled, kill the pool so the runaway skill doesn't hold a worker forever
+            if not future.cancel():
+                self.restart(terminate=True)
+            raise TimeoutError(f"{action.name} didn't finish within {action.timeout:g}s")
+        except BrokenProcessPool:
+            # A worker died (crash or OOM), start a fresh pool for the next call
+            self.restart()
+            raise
@@ -0,0 +1,113 @@
+import time
+import logging
+import threading
+from pathlib import Path
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog is optional, fall back to polling mtimes
+    Observer = None
+    FileSystemEventHandler = object
+
+logger = logging.getLogger(__name__)
+
+
+class SkillEventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        # Opening a file to import it must not count as a change
+        if event.is_directory or event.event_type not in ("created", "modified", "deleted", "moved"):
+            return
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path and str(path).endswith(".py"):
+                self.watcher.notify(Path(str(path)).name)
+
+
+class SkillWatcher:
+    """
+    Watches a skills directory in the background and reports which skill files changed.
+    Uses watchdog (inotify and friends) when it is installed and polls file mtimes otherwise.
+    Bursts of events are debounced, onChange(fileNames) runs on the watcher thread.
+    """
+    def __init__(self, skillDir, onChange, interval=1.0, debounce=0.3):
+        self.skillDir  = Path(skillDir)
+        self.onChange  = onChange
+        self.interval  = interval
+        self.debounce  = debounce
+        self.lock      = threading.Lock()
+        self.wake      = threading.Event()
+        self.stopped   = threading.Event()
+        self.pending   = set()
+        self.snapshot  = {}
+        self.observer  = None
+        self.thread    = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.snapshot = self.scan()
+        if Observer is not None:
+            self.observer = Observer()
+            self.observer.schedule(SkillEventHandler(self), str(self.skillDir), recursive=False)
+            self.observer.daemon = True
+            self.observer.start()
+        self.thread = threading.Thread(target=self.watch, name="SkillWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer = None
+        self.thread = None
+
+    def notify(self, fileName):
+        with self.lock:
+            self.pending.add(fileName)
+        self.wake.set()
+
+    def scan(self):
+        if not self.skillDir.is_dir():
+            return {}
+        snapshot = {}
+        for py in self.skillDir.iterdir():
+            if py.suffix == ".py" and py.name != "__init__.py":
+                try:
+                    stat = py.stat()
+                except OSError:
+                    continue
+                snapshot[py.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def diff(self):
+        """Get the files added, removed or modified since the last scan."""
+        current = self.scan()
+        previous = self.snapshot
+        self.snapshot = current
+        changed = set(current) ^ set(previous)
+        changed |= {name for name in set(current) & set(previous) if current[name] != previous[name]}
+        return changed
+
+    def watch(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.interval)
+            if self.stopped.is_set():
+                break
+            if self.wake.is_set():
+                # Let editors finish writing before reacting to the burst
+                time.sleep(self.debounce)
+                self.wake.clear()
+            with self.lock:
+                changed, self.pending = self.pending, set()
+            # The scan also covers polling mode and catches anything watchdog coalesced away
+            changed |= self.diff()
+            if not changed:
+                continue
+            try:
+                self.onChange(changed)
+            except Exception:
+                logger.error(f"Reloading changed skills {sorted(changed)} failed:", exc_info=True)
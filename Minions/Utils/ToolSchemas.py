@@ -12,15 +12,12 @@ load_dotenv()
 class BaseSchemaManager:
     def __init__(self):
         self.showLoadedTools = os.getenv('SHOW_LOADED_TOOLS', 'False') == 'True'
-        self.graph = SkillSkillGraph()
-        self._toolFunctions = None
-        self._toolSchemas = None
+        self.graph = SkillGraph()
         self.printToolsSchema()
 
     def loadTools(self):
-        if self._toolFunctions is None:
-            self._toolFunctions = self.graph.getTools()
-        return self._toolFunctions
+        # Tools and schemas live on the skill catalog, so a skill reload invalidates them
+        return self.graph.getTools()
 
     def callFunction(self, *args, **kwargs):
         return self.graph.executeTool(*args, **kwargs)
@@ -35,17 +32,37 @@ class BaseSchemaManager:
         return self.loadTools()
 
     def getToolSchemas(self):
-        if self._toolSchemas is None:
-            toolFunctions = self.getToolFunctions()
-            self._toolSchemas = [self.buildToolSchema(f) for f in toolFunctions.values()]
-        return self._toolSchemas
+        raise NotImplementedError("Subclasses must implement getToolSchemas.")
+
+    def parseToolCalls(self, response):
+        raise NotImplementedError("Subclasses must implement parseToolCalls.")
+
 
-    
 
 class JsonSchemaManager(BaseSchemaManager):
+    def __init__(self, schemaType="chat_completions"):
+        self.schemaType = schemaType
+        super().__init__()
 
-    def buildToolSchema(self, func, schemaType="chat_completions"):
-        return self.graph.getJsonSchema(func, schemaType)
+    def buildToolSchema(self, func, schemaType=None):
+        return self.graph.getJsonSchema(func, schemaType or self.schemaType)
+
+    def getToolSchemas(self):
+        return self.graph.getToolSchemas(self.schemaType)
+
+    def parseToolCalls(self, message):
+        """
+        Get [(name, args)] for every tool call in an OpenAI chat completion message.
+        """
+        calls = []
+        for toolCall in getattr(message, "tool_calls", None) or []:
+            arguments = toolCall.function.arguments or "{}"
+            try:
+                args = json.loads(arguments)
+            except ValueError:
+                args = self.extractJson(arguments)
+            calls.append((toolCall.function.name, args if isinstance(args, dict) else {}))
+        return calls
 
     def handleFormat(self, role: str, content: str):
         return self.graph.handleJsonFormat(role, content)
@@ -66,22 +83,33 @@ class JsonSchemaManager(BaseSchemaManager):
 
 
 class TypedSchemaManager(BaseSchemaManager):
+    def __init__(self):
+        self._declarations = None
+        self._toolSchemas = None
+        super().__init__()
 
     def buildToolSchema(self, func):
         return self.graph.getTypedSchema(func)
 
     def buildTools(self):
-        toolFunctions = self.loadTools()
-        functionDeclarations = [self.buildToolSchema(f) for f in toolFunctions.values()]
+        functionDeclarations = self.graph.getToolSchemas("typed")
         tools = [types.Tool(function_declarations=functionDeclarations)]
+        self._declarations = functionDeclarations
         self._toolSchemas = tools
         return tools
 
     def getToolSchemas(self):
-        if self._toolSchemas is None:
+        # The graph hands out new declarations after a skill reload
+        if self._toolSchemas is None or self._declarations is not self.graph.getToolSchemas("typed"):
             return self.buildTools()
         return self._toolSchemas
 
+    def parseToolCalls(self, response):
+        """
+        Get [(name, args)] for every function call in a Google GenAI response.
+        """
+        return [(call.name, dict(call.args or {})) for call in (getattr(response, "function_calls", None) or [])]
+
     def handleFormat(self, role: str, content: str):
         return self.graph.handleTypedFormat(role, content)
 
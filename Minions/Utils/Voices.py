@@ -1,38 +1,253 @@
-
-import pyttsx4
+import os
+import sys
+import json
 import random
+import shutil
+import hashlib
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
 
 
 class MinionVoices:
+    """
+    Minion narration through pyttsx4.
+
+    Speech runs on a dedicated thread that owns the engine: mainSpeak/subSpeak enqueue and return at once,
+    so LLM calls and skills keep running while lines play. The queue is bounded, when it backs up the
+    SPEECH_POLICY decides what happens to a new line:
+        merge  append it to the last queued line when both use the same voice settings, otherwise wait (default)
+        drop   discard the oldest queued line to make room
+        block  wait until the speech thread makes room
+    flush() discards lines not spoken yet and wait() blocks until everything queued has been spoken.
+    With SPEECH_ASYNC=False every line is spoken inline, the old blocking behavior.
+
+    With SPEECH_CACHE=True lines are rendered to WAV files once, content-addressed by (text, voice, rate, pitch, volume)
+    under SPEECH_CACHE_DIR, and replayed from disk. SPEECH_HEADLESS=True renders to the cache without touching
+    an audio device, for servers without a sound card, renderSpeech() returns the file for a line.
+    """
     UNWANTED_CHARS = "=[]()*"
+    POLICIES = ("merge", "drop", "block")
+
     def __init__(self):
-        self.engine = pyttsx4.init()
-        self.voices = self.engine.getProperty('voices')
+        # The engine starts on the first spoken line, so building the bus stays cheap
+        self.engine = None
+        self.voices = []
         self.messages = []
+        self.speakAsync = os.getenv("SPEECH_ASYNC", "True") == "True"
+        self.maxQueue = max(1, int(os.getenv("SPEECH_QUEUE_SIZE", "8")))
+        self.policy = os.getenv("SPEECH_POLICY", "merge")
+        if self.policy not in self.POLICIES:
+            logger.warning(f"Unknown SPEECH_POLICY {self.policy!r}, using 'merge'")
+            self.policy = "merge"
+        # pyttsx4 engines are not thread-safe, only one line is ever spoken at a time
+        self.lock = threading.Lock()
+        self.queue = deque()
+        self.queueLock = threading.Condition()
+        self.speaking = False
+        self.dropped = 0
+        self.merged = 0
+        self.thread = None
+        self.headless = os.getenv("SPEECH_HEADLESS", "False") == "True"
+        self.useCache = self.headless or os.getenv("SPEECH_CACHE", "False") == "True"
+        self.cacheDir = Path(os.getenv("SPEECH_CACHE_DIR") or ".speechCache")
+        self.player = None if self.headless else self.findPlayer()
+        self.warmQueue = deque()
+        self.cacheHits = 0
+        self.rendered = 0
+
+    def getEngine(self):
+        """Start the pyttsx4 engine on first use, call with self.lock held."""
+        if self.engine is None:
+            import pyttsx4
+            self.engine = pyttsx4.init()
+            self.voices = self.engine.getProperty('voices')
+        return self.engine
 
     def cleanText(self, text):
         for char in self.UNWANTED_CHARS:
             text = text.replace(char, "")
         return text.strip()
 
-    def mainSpeak(self, text, rate=250, pitch=150, volume=0.5):
-        print(f"\n{text}\n")
-        text = self.cleanText(text)
-        voice = self.voices[random.randint(6, 7)]
-        self.engine.setProperty('voice', voice.id)
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('pitch', pitch)
-        self.engine.setProperty('volume', volume)
-        self.engine.say(text)
-        self.engine.runAndWait()
-
-    def subSpeak(self, text, rate=300, pitch=150, volume=0.5):
-        print(f"\n{text}\n")
-        text = self.cleanText(text)
-        voice = self.voices[random.randint(5, 6)]
-        self.engine.setProperty('voice', voice.id)
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('pitch', pitch)
-        self.engine.setProperty('volume', volume)
-        self.engine.say(text)
-        self.engine.runAndWait()
\ No newline at end of file
+    def mainSpeak(self, text, rate=250, pitch=150, volume=0.5, echo=True):
+        if echo:
+            print(f"\n{text}\n")
+        self.speak(self.cleanText(text), (6, 7), rate, pitch, volume)
+
+    def subSpeak(self, text, rate=300, pitch=150, volume=0.5, echo=True):
+        if echo:
+            print(f"\n{text}\n")
+        self.speak(self.cleanText(text), (5, 6), rate, pitch, volume)
+
+    def speak(self, text, voiceRange, rate, pitch, volume):
+        if not text:
+            return
+        line = {"text": text, "voiceRange": voiceRange, "rate": rate, "pitch": pitch, "volume": volume}
+        if not self.speakAsync:
+            self.say(line)
+            return
+        with self.queueLock:
+            self.startThread()
+            if len(self.queue) >= self.maxQueue:
+                if self.policy == "merge" and self.sameVoice(self.queue[-1], line):
+                    self.queue[-1]["text"] += f" {text}"
+                    self.merged += 1
+                    return
+                if self.policy == "drop":
+                    self.queue.popleft()
+                    self.dropped += 1
+                else:
+                    self.queueLock.wait_for(lambda: len(self.queue) < self.maxQueue)
+            self.queue.append(line)
+            self.queueLock.notify_all()
+
+    def sameVoice(self, queued, line):
+        """Check that two lines can be spoken as one without changing the voice, rate, pitch or volume."""
+        return all(queued[key] == line[key] for key in ("voiceRange", "rate", "pitch", "volume"))
+
+    def startThread(self):
+        """Start the speech thread, call with self.queueLock held."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.speechLoop, name="MinionVoices", daemon=True)
+            self.thread.start()
+
+    def speechLoop(self):
+        while True:
+            with self.queueLock:
+                self.queueLock.wait_for(lambda: self.queue or self.warmQueue)
+                # Spoken lines always go before warming the cache
+                warming = not self.queue
+                line = self.warmQueue.popleft() if warming else self.queue.popleft()
+                self.speaking = not warming
+                self.queueLock.notify_all()
+            try:
+                if warming:
+                    self.renderSpeech(**line)
+                else:
+                    self.say(line)
+            except Exception:
+                logger.error("Speech failed:", exc_info=True)
+            finally:
+                with self.queueLock:
+                    self.speaking = False
+                    self.queueLock.notify_all()
+
+    def say(self, line):
+        if self.useCache and (self.headless or self.player):
+            path = self.renderSpeech(line["text"], line["voiceRange"], line["rate"], line["pitch"], line["volume"])
+            if path is not None and (self.headless or self.playFile(path)):
+                return path
+        self.sayLive(line)
+
+    def sayLive(self, line):
+        with self.lock:
+            engine = self.getEngine()
+            voice = self.voices[random.randint(*line["voiceRange"])]
+            engine.setProperty('voice', voice.id)
+            engine.setProperty('rate', line["rate"])
+            engine.setProperty('pitch', line["pitch"])
+            engine.setProperty('volume', line["volume"])
+            engine.say(line["text"])
+            engine.runAndWait()
+
+    def chooseVoice(self, voiceRange):
+        with self.lock:
+            self.getEngine()
+            return self.voices[random.randint(*voiceRange)].id
+
+    def cachePath(self, text, voiceId, rate, pitch, volume):
+        raw = json.dumps([text, voiceId, rate, pitch, volume], ensure_ascii=False)
+        return self.cacheDir / f"{hashlib.sha256(raw.encode('utf-8')).hexdigest()}.wav"
+
+    def renderSpeech(self, text, voiceRange=(6, 7), rate=250, pitch=150, volume=0.5, voiceId=None):
+        """
+        Get the WAV file for a line, synthesizing it with pyttsx4 save_to_file only on a cache miss.
+        """
+        voiceId = voiceId or self.chooseVoice(voiceRange)
+        path = self.cachePath(text, voiceId, rate, pitch, volume)
+        if path.exists():
+            self.cacheHits += 1
+            return path
+        self.cacheDir.mkdir(parents=True, exist_ok=True)
+        tmpPath = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp.wav")
+        with self.lock:
+            engine = self.getEngine()
+            engine.setProperty('voice', voiceId)
+            engine.setProperty('rate', rate)
+            engine.setProperty('pitch', pitch)
+            engine.setProperty('volume', volume)
+            engine.save_to_file(text, str(tmpPath))
+            engine.runAndWait()
+        if not tmpPath.exists():
+            logger.warning(f"Speech engine rendered nothing for {text!r}")
+            return None
+        os.replace(tmpPath, path)
+        self.rendered += 1
+        return path
+
+    def getAudio(self, text, voiceRange=(6, 7), rate=250, pitch=150, volume=0.5):
+        """Get the rendered WAV bytes for a line, for callers that serve audio instead of playing it."""
+        path = self.renderSpeech(self.cleanText(text), voiceRange, rate, pitch, volume)
+        return path.read_bytes() if path else None
+
+    def warm(self, phrases, voiceRange=(6, 7), rate=250, pitch=150, volume=0.5):
+        """
+        Render recurring phrases into the cache in the background, for every voice in the range.
+        Warming only runs while nothing is waiting to be spoken.
+        """
+        if not self.useCache:
+            return
+        with self.queueLock:
+            for phrase in phrases:
+                for voiceIndex in range(voiceRange[0], voiceRange[1] + 1):
+                    self.warmQueue.append({
+                        "text": self.cleanText(phrase), "voiceRange": (voiceIndex, voiceIndex),
+                        "rate": rate, "pitch": pitch, "volume": volume,
+                    })
+            self.startThread()
+            self.queueLock.notify_all()
+
+    def findPlayer(self):
+        if sys.platform == "win32":
+            return "winsound"
+        for player in ("afplay", "paplay", "aplay"):
+            path = shutil.which(player)
+            if path:
+                return path
+        return None
+
+    def playFile(self, path):
+        try:
+            if self.player == "winsound":
+                import winsound
+                winsound.PlaySound(str(path), winsound.SND_FILENAME)
+            else:
+                subprocess.run([self.player, str(path)], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return True
+        except Exception:
+            logger.warning(f"Could not play {path}, speaking live instead", exc_info=True)
+            return False
+
+    def flush(self):
+        """Discard every queued line that hasn't started playing, returns how many were dropped."""
+        with self.queueLock:
+            count = len(self.queue)
+            self.queue.clear()
+            self.dropped += count
+            self.queueLock.notify_all()
+            return count
+
+    def wait(self, timeout=None):
+        """Block until every queued line has been spoken. Returns False if the timeout ran out first."""
+        with self.queueLock:
+            return self.queueLock.wait_for(lambda: not self.queue and not self.speaking, timeout)
+
+    def pending(self):
+        with self.queueLock:
+            return len(self.queue) + (1 if self.speaking else 0)
@@ -0,0 +1,101 @@
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+
+
+class FakeProvider:
+    """
+    Deterministic stand-in LLM provider for benchmarks.
+
+    Every call sleeps for `latency` seconds (plus up to `jitter` of that, from a seeded RNG) and answers with
+    a canned response picked from the prompt: plans and step lists come from `plans` (goal -> steps), clarified
+    actions from `clarify` (step text -> skill call), and everything else gets a short minion reply.
+    install() plugs it into a caller's MinionTool.providerMap, so every MinionTool the caller builds uses it.
+    """
+    PROVIDER = "fake"
+
+    def __init__(self, plans, clarify, latency=0.05, jitter=0.0, seed=0):
+        self.plans   = plans
+        self.clarify = clarify
+        self.latency = latency
+        self.jitter  = jitter
+        self.rng     = random.Random(seed)
+        self.lock    = threading.Lock()
+        self.calls   = 0
+
+    def install(self, callerModule):
+        provider = self
+        original = callerModule.MinionTool.__init__
+        if getattr(original, "fakeProvider", None) is not None:
+            original = original.original
+
+        def init(tool, *args, **kwargs):
+            original(tool, *args, **kwargs)
+            tool.provider = provider.PROVIDER
+            tool.providerMap[provider.PROVIDER]            = provider.run
+            tool.asyncProviderMap[provider.PROVIDER]       = provider.arun
+            tool.streamProviderMap[provider.PROVIDER]      = provider.stream
+            tool.asyncStreamProviderMap[provider.PROVIDER] = provider.astream
+
+        init.fakeProvider = provider
+        init.original = original
+        callerModule.MinionTool.__init__ = init
+
+    def delay(self):
+        with self.lock:
+            self.calls += 1
+            return self.latency * (1 + self.jitter * self.rng.random())
+
+    # ----- Provider functions -----
+    def run(self, systemMsg, userMsg):
+        time.sleep(self.delay())
+        return self.respond(systemMsg, userMsg)
+
+    async def arun(self, systemMsg, userMsg):
+        await asyncio.sleep(self.delay())
+        return self.respond(systemMsg, userMsg)
+
+    def stream(self, systemMsg, userMsg):
+        time.sleep(self.delay())
+        for word in self.respond(systemMsg, userMsg).split(" "):
+            yield word + " "
+
+    async def astream(self, systemMsg, userMsg):
+        await asyncio.sleep(self.delay())
+        for word in self.respond(systemMsg, userMsg).split(" "):
+            yield word + " "
+
+    # ----- Canned responses -----
+    def findGoal(self, userMsg):
+        match = re.search(r"Goal: (.*)$", userMsg, re.MULTILINE)
+        return match.group(1).strip() if match else None
+
+    def respond(self, systemMsg, userMsg):
+        if "First restate the user goal" in userMsg:
+            goal = self.findGoal(userMsg)
+            steps = self.plans.get(goal, [])
+            return json.dumps({
+                "goal": goal,
+                "noActionsNeeded": not steps,
+                "answer": "" if steps else "Bello! Poopaye!",
+                "steps": steps,
+            })
+        if "Restate the following user goal" in userMsg:
+            return self.findGoal(userMsg)
+        if "break down the goal" in userMsg:
+            steps = self.plans.get(self.findGoal(userMsg), [])
+            return "\n".join(f"- {step}" for step in steps) if steps else "NO ACTIONS NEEDED"
+        if "For EVERY minion, list the NAMES" in userMsg:
+            tasks = userMsg.split("team of minions:\n", 1)[-1].split("\n\n", 1)[0]
+            return json.dumps({line.split(":", 1)[0].strip(): [] for line in tasks.splitlines() if ":" in line})
+        if "determining your dependencies" in systemMsg:
+            return "NONE"
+        step = userMsg.splitlines()[0].strip() if userMsg.strip() else ""
+        if step in self.clarify:
+            return self.clarify[step]
+        if "Answer this question in a fun minion way" in userMsg:
+            return "Bello! Poopaye!"
+        return "Bello! Here you go, banana! Poopaye!"
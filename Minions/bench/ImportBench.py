@@ -0,0 +1,80 @@
+"""
+Import-time budget check for the Basic, Advanced and Speaking callers.
+
+Imports every caller in a fresh interpreter under `python -X importtime`, takes the median cumulative
+import time over --runs and fails when it is over --budget milliseconds, or when a module that must
+only load on first use (a provider SDK, the speech engine) was imported anyway.
+
+    python bench/ImportBench.py --budget 1000 --runs 5
+"""
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CALLERS = {
+    "Basic":    "Callers.Basic",
+    "Advanced": "Callers.Advanced",
+    "Speaking": "Callers.Speaking",
+}
+
+# Built on first use, importing a caller must not load them
+LAZY_MODULES = ("openai", "pyttsx4")
+
+
+def importTimes(module):
+    """Import module in a fresh interpreter, get {module name: cumulative microseconds} for everything it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "SKILL_WATCH": "False"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            times[name] = int(cumulative)
+    return times
+
+
+def checkCaller(name, runs, budget):
+    """Get the median import time in ms and the problems found for one caller."""
+    module = CALLERS[name]
+    samples, problems = [], []
+    for _ in range(runs):
+        times = importTimes(module)
+        samples.append(times.get(module, 0) / 1000)
+        eager = sorted(m for m in times if m.split(".")[0] in LAZY_MODULES)
+        if eager and not problems:
+            problems.append(f"imports {', '.join(eager[:5])} at import time")
+    median = sorted(samples)[len(samples) // 2]
+    if median > budget:
+        problems.append(f"median import time {median:.0f} ms is over the {budget:.0f} ms budget")
+    return median, problems
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Import-time budget check for the minion callers")
+    parser.add_argument("--callers", nargs="+", choices=list(CALLERS), default=list(CALLERS))
+    parser.add_argument("--budget", type=float, default=1000,
+                        help="Milliseconds importing one caller may take")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh imports per caller, the median is checked")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    failed = False
+    print(f"{'caller':<12}{'import ms':>10}")
+    for name in args.callers:
+        median, problems = checkCaller(name, max(1, args.runs), args.budget)
+        print(f"{name:<12}{median:>10.0f}" + ("   " + "; ".join(problems) if problems else ""))
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,246 @@
+"""
+Offline benchmark for the Basic, Advanced and Speaking callers.
+
+Runs canned goals of different shapes through each caller with FakeProvider standing in for the LLM
+and the weather skill's HTTP session stubbed out, then reports per caller and shape:
+LLM calls per goal, wall-clock p50/p95 and the CPU time spent orchestrating.
+
+    python bench/MinionBench.py --runs 20 --latency 0.05 --output bench/results.json
+    python bench/MinionBench.py --compare bench/results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import importlib
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.chdir(ROOT)  # Skills are found relative to the working directory
+
+# Settings the callers read at import time, a benchmark must never hit a real provider or a stale cache
+os.environ["LLM_CACHE"] = "False"
+os.environ["SKILL_WATCH"] = "False"
+os.environ["TOOL_CALLING"] = "False"
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+
+from FakeProvider import FakeProvider
+
+CALLERS = {
+    "Basic":    "Callers.Basic",
+    "Advanced": "Callers.Advanced",
+    "Speaking": "Callers.Speaking",
+}
+
+SPOKANE = "47.6588, -117.4260"
+
+# Goal shape -> (goal, planned steps)
+SHAPES = {
+    "direct": ("Tell me a minion joke", []),
+    "oneStep": ("What time is it?", ["get_current_time()"]),
+    "nSteps": ("What's the time, the date and the weather in Spokane?", [
+        "get_current_time()",
+        "get_current_date()",
+        f"get_weather({SPOKANE})",
+        f"get_humidity({SPOKANE})",
+    ]),
+    # Plain-language steps have to be clarified, and with more than two minions Advanced/Speaking delegate
+    "delegation": ("Give me a full Spokane status report", [
+        "Find the current time",
+        "Find today's date",
+        "Check the temperature in Spokane",
+        "Check the humidity in Spokane",
+        "Check the wind in Spokane",
+    ]),
+}
+
+CLARIFY = {
+    "Find the current time": "get_current_time()",
+    "Find today's date": "get_current_date()",
+    "Check the temperature in Spokane": f"get_weather({SPOKANE})",
+    "Check the humidity in Spokane": f"get_humidity({SPOKANE})",
+    "Check the wind in Spokane": f"get_wind_speed({SPOKANE})",
+}
+
+FORECAST = {
+    "current_weather": {"temperature": 21.5, "windspeed": 3.2},
+    "hourly": {"relative_humidity_2m": [40]},
+}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Replaces a skill's requests session, answering every request with a canned forecast."""
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get(self, url, **kwargs):
+        time.sleep(self.latency)
+        return FakeResponse(FORECAST)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    return {
+        "mean": round(sum(values) / len(values), 4),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "total": round(sum(values), 4),
+    }
+
+
+class MinionBench:
+    def __init__(self, runs=10, latency=0.05, jitter=0.0, skillLatency=0.01, seed=0, useAsync=False):
+        self.runs         = runs
+        self.latency      = latency
+        self.jitter       = jitter
+        self.skillLatency = skillLatency
+        self.seed         = seed
+        self.useAsync     = useAsync
+        self.provider     = FakeProvider({goal: steps for goal, steps in SHAPES.values()}, CLARIFY, latency, jitter, seed)
+
+    def loadCaller(self, name):
+        module = importlib.import_module(CALLERS[name])
+        self.provider.install(module)
+        if hasattr(module, "MinionVoices"):
+            # Nothing is spoken during a benchmark
+            module.MinionVoices.speak = lambda voices, *args, **kwargs: None
+            module.MinionVoices.warm = lambda voices, *args, **kwargs: None
+        return module
+
+    def stubSkills(self):
+        """Swap the skills' HTTP sessions for FakeSession and forget any cached results."""
+        from Utils.SkillGraph import SkillGraph
+        graph = SkillGraph()
+        graph.getCatalog()
+        graph.skillCache.clear()
+        for name, module in list(sys.modules.items()):
+            if not name.startswith("_dynamic_"):
+                continue
+            if hasattr(module, "_session"):
+                module._session = FakeSession(self.skillLatency)
+            if hasattr(module, "_forecasts"):
+                module._forecasts.clear()
+
+    def runGoal(self, mainMinion, goal):
+        random.seed(self.seed)  # Minion names and delegation choices repeat from run to run
+        self.stubSkills()
+        callsBefore = self.provider.calls
+        wallStart, cpuStart = time.perf_counter(), time.process_time()
+        if self.useAsync:
+            asyncio.run(mainMinion.aprocessInput(goal))
+        else:
+            mainMinion.processInput(goal)
+        wall, cpu = time.perf_counter() - wallStart, time.process_time() - cpuStart
+        return self.provider.calls - callsBefore, wall, cpu
+
+    def benchCaller(self, name):
+        module = self.loadCaller(name)
+        results = {}
+        for shape, (goal, _) in SHAPES.items():
+            calls, walls, cpus = [], [], []
+            for _ in range(self.runs):
+                mainMinion = module.MainMinion()
+                llmCalls, wall, cpu = self.runGoal(mainMinion, goal)
+                calls.append(llmCalls)
+                walls.append(wall)
+                cpus.append(cpu)
+            results[shape] = {
+                "goal": goal,
+                "runs": self.runs,
+                "llmCallsPerGoal": round(sum(calls) / len(calls), 2),
+                "wallSeconds": summarize(walls),
+                "cpuSeconds": summarize(cpus),
+            }
+        return results
+
+    def run(self, callers):
+        report = {
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "config": {
+                "runs": self.runs,
+                "latency": self.latency,
+                "jitter": self.jitter,
+                "skillLatency": self.skillLatency,
+                "seed": self.seed,
+                "mode": "async" if self.useAsync else "sync",
+                "fusedPlanning": os.getenv("FUSED_PLANNING", "True") == "True",
+                "directDispatch": os.getenv("DIRECT_DISPATCH", "True") == "True",
+            },
+            "results": {},
+        }
+        for name in callers:
+            # Callers narrate every goal, only the report belongs on stdout
+            with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+                report["results"][name] = self.benchCaller(name)
+            printCaller(name, report["results"][name])
+        return report
+
+
+def printCaller(name, results, previous=None):
+    print(f"\n{name}")
+    print(f"  {'shape':<12}{'llm calls':>10}{'wall p50':>10}{'wall p95':>10}{'cpu p50':>10}")
+    for shape, stats in results.items():
+        line = (f"  {shape:<12}{stats['llmCallsPerGoal']:>10}{stats['wallSeconds']['p50']:>10.3f}"
+                f"{stats['wallSeconds']['p95']:>10.3f}{stats['cpuSeconds']['p50']:>10.3f}")
+        before = (previous or {}).get(shape)
+        if before:
+            line += (f"   calls {stats['llmCallsPerGoal'] - before['llmCallsPerGoal']:+.2f}"
+                     f"  wall p50 {stats['wallSeconds']['p50'] - before['wallSeconds']['p50']:+.3f}s"
+                     f"  cpu p50 {stats['cpuSeconds']['p50'] - before['cpuSeconds']['p50']:+.3f}s")
+        print(line)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Offline benchmark for the minion callers")
+    parser.add_argument("--callers", nargs="+", choices=list(CALLERS), default=list(CALLERS))
+    parser.add_argument("--runs", type=int, default=10, help="Goals run per caller and shape")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds every fake LLM call takes")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra latency, as a fraction of --latency, drawn per call")
+    parser.add_argument("--skill-latency", type=float, default=0.01, help="Seconds every stubbed skill HTTP request takes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--async", dest="useAsync", action="store_true", help="Benchmark aprocessInput instead of processInput")
+    parser.add_argument("--output", default="bench/results.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="A previous JSON report to print deltas against")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    bench = MinionBench(args.runs, args.latency, args.jitter, args.skill_latency, args.seed, args.useAsync)
+    report = bench.run(args.callers)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {args.output}")
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"\nCompared with {args.compare} ({previous.get('createdAt')})")
+        for name, results in report["results"].items():
+            printCaller(name, results, previous.get("results", {}).get(name))